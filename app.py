@@ -12,16 +12,18 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime
-import json
+import io
+import orjson
 import tempfile
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # 导入必要的模块
 from utils.xml_parser import parse_experiment_xml, validate_xml_structure
 from utils.converters import UnitConverter
+from utils.helpers import downsample_for_plot, fast_csv, series_stats
 from utils.constants import *
 
 # 页面配置
@@ -40,6 +42,12 @@ if 'experiment_loaded' not in st.session_state:
 if 'data_groups' not in st.session_state:
     st.session_state.data_groups = []
 
+# 单条曲线发送到浏览器的最大点数
+MAX_PLOT_POINTS = 2000
+
+# 图表类型对应的Scattergl绘制模式
+CHART_MODES = {"折线图": 'lines', "散点图": 'markers', "折线+散点": 'lines+markers'}
+
 
 def main():
     """主函数"""
@@ -72,6 +80,7 @@ def main():
         if st.button("🗑️ 清除数据", use_container_width=True):
             st.session_state.current_experiment = None
             st.session_state.experiment_loaded = False
+            _clear_column_cache()
             st.rerun()
         
         st.markdown("---")
@@ -94,6 +103,96 @@ def main():
         export_data()
 
 
+_COL_CACHE_PREFIX = '_col::'
+
+
+def _col(dg_key, col, df):
+    """取数据列的连续NumPy数组，按 (数据组, 列名) 缓存在session_state中"""
+    key = f"{_COL_CACHE_PREFIX}{dg_key}::{col}"
+    arr = st.session_state.get(key)
+    if arr is None:
+        arr = np.ascontiguousarray(df[col].to_numpy())
+        st.session_state[key] = arr
+    return arr
+
+
+def _clear_column_cache():
+    """清除缓存的数据列数组（更换或清除实验数据时调用）"""
+    for key in [k for k in st.session_state.keys() if str(k).startswith(_COL_CACHE_PREFIX)]:
+        del st.session_state[key]
+
+
+def _df_to_jsonable(df):
+    """DataFrame转为 {'__df__', 'columns', 'data'} 结构；纯数值表直接交给orjson按缓冲区序列化"""
+    values = df.to_numpy()
+    if values.dtype.kind in 'fiub':
+        data = np.ascontiguousarray(values)
+    else:
+        data = values.tolist()
+    return {'__df__': True, 'columns': df.columns.tolist(), 'data': data}
+
+
+def _to_jsonable(obj):
+    """导出JSON前的预处理：转换DataFrame，跳过以下划线开头的内部字段"""
+    if isinstance(obj, pd.DataFrame):
+        return _df_to_jsonable(obj)
+    if isinstance(obj, dict):
+        return {k: _to_jsonable(v) for k, v in obj.items()
+                if not (isinstance(k, str) and k.startswith('_'))}
+    if isinstance(obj, (list, tuple)):
+        return [_to_jsonable(v) for v in obj]
+    return obj
+
+
+def _count_points(dg):
+    """数据组的数据点数"""
+    df = dg.get('data_df')
+    return len(df) if df is not None else len(dg.get('datapoints', ()))
+
+
+def _columnar(df):
+    """按列重建DataFrame，使每列独立连续存储，加速按列的统计与相关性计算"""
+    if not df.columns.is_unique:
+        return df
+    return pd.DataFrame({c: df[c].to_numpy() for c in df.columns})
+
+
+def _prepare_experiment(exp_data):
+    """解析后一次性预计算展示用的派生数据"""
+    for dg in exp_data.get('datagroups', ()):
+        if dg.get('data_df') is not None:
+            dg['data_df'] = _columnar(dg['data_df'])
+    exp_data['_total_points'] = sum(map(_count_points, exp_data.get('datagroups', ())))
+    exp_data['_group_names'] = _group_names(exp_data)
+    return exp_data
+
+
+def _group_names(exp_data):
+    """数据组显示名称（优先使用解析时预计算的结果）"""
+    names = exp_data.get('_group_names')
+    if names is None:
+        names = [dg.get('name') or f'数据组 {i+1}'
+                 for i, dg in enumerate(exp_data.get('datagroups', ()))]
+    return names
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _parse_cached(file_bytes: bytes):
+    """验证并解析XML文件，按文件内容缓存，返回 (is_valid, errors, exp_data)"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.xml') as tmp_file:
+        tmp_file.write(file_bytes)
+        tmp_path = tmp_file.name
+    
+    try:
+        is_valid, errors = validate_xml_structure(tmp_path)
+        if not is_valid:
+            return is_valid, errors, None
+        exp_data = parse_experiment_xml(tmp_path)
+        return is_valid, errors, _prepare_experiment(exp_data) if exp_data else exp_data
+    finally:
+        os.unlink(tmp_path)
+
+
 def load_experiment_file():
     """加载实验数据"""
     st.header("📂 加载实验数据")
@@ -118,31 +217,19 @@ def load_experiment_file():
         # 解析按钮
         if st.button("🔄 解析文件", type="primary", use_container_width=True):
             try:
-                # 创建临时文件
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.xml') as tmp_file:
-                    tmp_file.write(uploaded_file.getvalue())
-                    tmp_path = tmp_file.name
-                
-                # 验证XML结构
-                with st.spinner("验证文件结构..."):
-                    is_valid, errors = validate_xml_structure(tmp_path)
+                # 验证并解析XML文件（相同内容直接命中缓存）
+                with st.spinner("正在验证并解析XML文件..."):
+                    is_valid, errors, exp_data = _parse_cached(uploaded_file.getvalue())
                 
                 if not is_valid:
                     st.error("❌ XML文件结构验证失败：")
                     for error in errors:
                         st.error(f"  • {error}")
-                    os.unlink(tmp_path)
                     return
                 
-                # 解析XML文件
-                with st.spinner("正在解析XML文件..."):
-                    exp_data = parse_experiment_xml(tmp_path)
-                
-                # 删除临时文件
-                os.unlink(tmp_path)
-                
                 if exp_data:
                     # 存储到session state
+                    _clear_column_cache()
                     st.session_state.current_experiment = exp_data
                     st.session_state.experiment_loaded = True
                     
@@ -175,12 +262,9 @@ def display_experiment_summary(exp_data):
     with col2:
         st.metric("数据组数量", len(exp_data.get('datagroups', [])))
     with col3:
-        total_points = 0
-        for dg in exp_data.get('datagroups', []):
-            if 'data_df' in dg and dg['data_df'] is not None:
-                total_points += len(dg['data_df'])
-            elif 'datapoints' in dg:
-                total_points += len(dg['datapoints'])
+        total_points = exp_data.get('_total_points')
+        if total_points is None:
+            total_points = sum(map(_count_points, exp_data.get('datagroups', ())))
         st.metric("总数据点", total_points)
 
 
@@ -238,6 +322,48 @@ def display_basic_info(exp_data):
         st.write(f"• DOI: {bib.get('doi', 'N/A')}")
 
 
+@st.cache_data(show_spinner=False)
+def _props_to_df(props_items):
+    """实验条件属性表，按属性内容缓存"""
+    prop_data = []
+    for key, value in props_items:
+        if isinstance(value, dict):
+            prop_data.append({
+                '参数': key,
+                '值': value.get('value', ''),
+                '单位': value.get('units', '')
+            })
+        else:
+            prop_data.append({
+                '参数': key,
+                '值': value,
+                '单位': ''
+            })
+    return pd.DataFrame(prop_data)
+
+
+@st.cache_data(show_spinner=False)
+def _composition_to_df(comp_items):
+    """初始组分表，按组分内容缓存"""
+    comp_data = []
+    for species, info in comp_items:
+        if isinstance(info, dict):
+            comp_data.append({
+                '物种': species,
+                '含量': f"{info.get('amount', '')} {info.get('units', '')}",
+                'CAS': info.get('CAS', ''),
+                'SMILES': info.get('SMILES', '')
+            })
+        else:
+            comp_data.append({
+                '物种': species,
+                '含量': str(info),
+                'CAS': '',
+                'SMILES': ''
+            })
+    return pd.DataFrame(comp_data)
+
+
 def display_experimental_conditions(exp_data):
     """显示实验条件"""
     col1, col2 = st.columns(2)
@@ -261,49 +387,15 @@ def display_experimental_conditions(exp_data):
         props = exp_data['common_properties']
         
         # 显示属性
-        prop_data = []
-        for key, value in props.items():
-            if key != 'initial_composition':
-                if isinstance(value, dict):
-                    prop_data.append({
-                        '参数': key,
-                        '值': value.get('value', ''),
-                        '单位': value.get('units', '')
-                    })
-                else:
-                    prop_data.append({
-                        '参数': key,
-                        '值': value,
-                        '单位': ''
-                    })
-        
-        if prop_data:
-            df = pd.DataFrame(prop_data)
+        df = _props_to_df(tuple((k, v) for k, v in props.items() if k != 'initial_composition'))
+        if not df.empty:
             st.dataframe(df, use_container_width=True, hide_index=True)
         
         # 显示初始组分
         if 'initial_composition' in props:
             st.write("**🧪 初始组分**")
-            comp = props['initial_composition']
-            comp_data = []
-            for species, info in comp.items():
-                if isinstance(info, dict):
-                    comp_data.append({
-                        '物种': species,
-                        '含量': f"{info.get('amount', '')} {info.get('units', '')}",
-                        'CAS': info.get('CAS', ''),
-                        'SMILES': info.get('SMILES', '')
-                    })
-                else:
-                    comp_data.append({
-                        '物种': species,
-                        '含量': str(info),
-                        'CAS': '',
-                        'SMILES': ''
-                    })
-            
-            if comp_data:
-                df_comp = pd.DataFrame(comp_data)
+            df_comp = _composition_to_df(tuple(props['initial_composition'].items()))
+            if not df_comp.empty:
                 st.dataframe(df_comp, use_container_width=True, hide_index=True)
 
 
@@ -338,7 +430,7 @@ def display_data_tables(exp_data):
                 st.dataframe(df, use_container_width=True, height=400)
                 
                 # 下载选项
-                csv = df.to_csv(index=False)
+                csv = fast_csv(df)
                 st.download_button(
                     "📥 下载CSV",
                     data=csv,
@@ -349,14 +441,15 @@ def display_data_tables(exp_data):
             elif 'datapoints' in dg and dg['datapoints']:
                 # 如果没有data_df但有datapoints，尝试创建DataFrame
                 try:
-                    df = pd.DataFrame(dg['datapoints'])
+                    df = _columnar(pd.DataFrame(dg['datapoints']))
                     st.dataframe(df, use_container_width=True, height=400)
                 except:
                     st.info("数据格式不支持表格显示")
 
 
+@st.fragment
 def display_quick_preview(exp_data):
-    """快速预览数据"""
+    """快速预览数据（fragment：控件交互只重跑本函数）"""
     datagroups = exp_data.get('datagroups', [])
     
     if not datagroups:
@@ -364,10 +457,7 @@ def display_quick_preview(exp_data):
         return
     
     # 选择数据组
-    group_names = []
-    for i, dg in enumerate(datagroups):
-        name = dg.get('name', f'数据组 {i+1}')
-        group_names.append(name)
+    group_names = _group_names(exp_data)
     
     selected_idx = st.selectbox("选择数据组", range(len(group_names)), 
                                 format_func=lambda x: group_names[x])
@@ -390,10 +480,13 @@ def display_quick_preview(exp_data):
                     y_col = st.selectbox("Y轴", available_y, key="preview_y")
                 
                 if x_col and y_col:
+                    x_plot, y_plot = downsample_for_plot(_col(selected_idx, x_col, df),
+                                                         _col(selected_idx, y_col, df),
+                                                         MAX_PLOT_POINTS)
                     fig = go.Figure()
-                    fig.add_trace(go.Scatter(
-                        x=df[x_col],
-                        y=df[y_col],
+                    fig.add_trace(go.Scattergl(
+                        x=x_plot,
+                        y=y_plot,
                         mode='lines+markers',
                         name=y_col
                     ))
@@ -402,14 +495,16 @@ def display_quick_preview(exp_data):
                         xaxis_title=x_col,
                         yaxis_title=y_col,
                         height=400,
-                        template="plotly_white"
+                        template="plotly_white",
+                        uirevision='keep'
                     )
                     
                     st.plotly_chart(fig, use_container_width=True)
 
 
+@st.fragment
 def visualize_data():
-    """数据可视化"""
+    """数据可视化（fragment：控件交互只重跑本函数）"""
     st.header("📊 数据可视化")
     
     if not st.session_state.experiment_loaded or not st.session_state.current_experiment:
@@ -424,10 +519,7 @@ def visualize_data():
         return
     
     # 选择数据组
-    group_names = []
-    for i, dg in enumerate(datagroups):
-        name = dg.get('name', f'数据组 {i+1}')
-        group_names.append(name)
+    group_names = _group_names(exp_data)
     
     selected_idx = st.selectbox("选择数据组", range(len(group_names)), 
                                 format_func=lambda x: group_names[x])
@@ -466,70 +558,44 @@ def visualize_data():
             height = st.slider("图表高度", 400, 800, 500)
     
     if y_cols:
-        # 创建图表
-        fig = go.Figure()
+        layout = {
+            'title': {'text': dg.get('name', '数据可视化')},
+            'xaxis': {'title': {'text': x_col}, 'showgrid': show_grid,
+                      'type': 'log' if x_scale == "对数" else '-'},
+            'yaxis': {'title': {'text': "值"}, 'showgrid': show_grid,
+                      'type': 'log' if y_scale == "对数" else '-'},
+            'template': "plotly_white",
+            'showlegend': show_legend,
+            'height': height,
+            'hovermode': 'x unified',
+            'uirevision': 'keep'
+        }
         
+        # 直接以字典组装图表，只做一次整体校验，避免逐条add_trace/update_*的重复校验
+        x_values = _col(selected_idx, x_col, df)
+        traces = []
         for y_col in y_cols:
-            if chart_type == "折线图":
-                fig.add_trace(go.Scatter(
-                    x=df[x_col], y=df[y_col],
-                    mode='lines', name=y_col
-                ))
-            elif chart_type == "散点图":
-                fig.add_trace(go.Scatter(
-                    x=df[x_col], y=df[y_col],
-                    mode='markers', name=y_col
-                ))
-            elif chart_type == "折线+散点":
-                fig.add_trace(go.Scatter(
-                    x=df[x_col], y=df[y_col],
-                    mode='lines+markers', name=y_col
-                ))
-            elif chart_type == "柱状图":
-                fig.add_trace(go.Bar(
-                    x=df[x_col], y=df[y_col],
-                    name=y_col
-                ))
-        
-        # 更新布局
-        fig.update_layout(
-            title=dg.get('name', '数据可视化'),
-            xaxis_title=x_col,
-            yaxis_title="值",
-            template="plotly_white",
-            showlegend=show_legend,
-            height=height,
-            hovermode='x unified'
-        )
-        
-        # 设置轴类型
-        if x_scale == "对数":
-            fig.update_xaxes(type="log")
-        if y_scale == "对数":
-            fig.update_yaxes(type="log")
-        
-        # 网格设置
-        fig.update_xaxes(showgrid=show_grid)
-        fig.update_yaxes(showgrid=show_grid)
+            y_values = _col(selected_idx, y_col, df)
+            if chart_type == "柱状图":
+                # 每个系列一条柱状图轨迹，文本列与数值列可以混选
+                traces.append({'type': 'bar', 'x': x_values, 'y': y_values, 'name': y_col})
+            else:
+                # 大数据量时只发送降采样后的代表点
+                x_plot, y_plot = downsample_for_plot(x_values, y_values, MAX_PLOT_POINTS)
+                traces.append({'type': 'scattergl', 'x': x_plot, 'y': y_plot,
+                               'mode': CHART_MODES[chart_type], 'name': y_col})
+        if chart_type == "柱状图":
+            layout['barmode'] = 'group'
+        fig = go.Figure({'data': traces, 'layout': layout})
         
         st.plotly_chart(fig, use_container_width=True)
+        if len(df) > MAX_PLOT_POINTS and chart_type != "柱状图":
+            st.caption(f"数据点较多（{len(df)}），图中每条曲线最多显示 {MAX_PLOT_POINTS} 个代表点")
         
         # 数据统计
         if st.checkbox("显示统计信息"):
             st.markdown("### 📊 数据统计")
-            stats_data = []
-            for y_col in y_cols:
-                values = df[y_col].dropna()
-                stats_data.append({
-                    "数据系列": y_col,
-                    "最小值": values.min(),
-                    "最大值": values.max(),
-                    "平均值": values.mean(),
-                    "标准差": values.std(),
-                    "数据点数": len(values)
-                })
-            
-            stats_df = pd.DataFrame(stats_data)
+            stats_df = series_stats(df, y_cols)
             st.dataframe(stats_df, use_container_width=True, hide_index=True)
 
 
@@ -556,7 +622,7 @@ def analyze_data():
     
     if analysis_type == "基础统计":
         # 选择数据组
-        group_names = [dg.get('name', f'数据组 {i+1}') for i, dg in enumerate(datagroups)]
+        group_names = _group_names(exp_data)
         selected_idx = st.selectbox("选择数据组", range(len(group_names)), 
                                    format_func=lambda x: group_names[x])
         
@@ -570,13 +636,27 @@ def analyze_data():
             # 选择列进行详细分析
             selected_col = st.selectbox("选择列进行详细分析", df.columns)
             
+            vals = np.empty(0)
             if selected_col:
+                vals = pd.to_numeric(df[selected_col], errors='coerce').dropna().to_numpy()
+            
+            if selected_col and vals.size == 0:
+                st.info("所选列没有数值数据")
+            elif selected_col:
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    # 直方图
+                    # 直方图（服务端分箱，只发送各箱的中心、宽度和频数）
+                    # 'auto'在长尾数据上可能给出上万个箱，限制在200以内
+                    n_bins = min(len(np.histogram_bin_edges(vals, bins='auto')) - 1, 200)
+                    counts, edges = np.histogram(vals, bins=n_bins)
                     fig_hist = go.Figure()
-                    fig_hist.add_trace(go.Histogram(x=df[selected_col], name=selected_col))
+                    fig_hist.add_trace(go.Bar(
+                        x=0.5 * (edges[:-1] + edges[1:]),
+                        y=counts,
+                        width=np.diff(edges),
+                        name=selected_col
+                    ))
                     fig_hist.update_layout(
                         title=f"{selected_col} 分布",
                         xaxis_title=selected_col,
@@ -586,9 +666,14 @@ def analyze_data():
                     st.plotly_chart(fig_hist, use_container_width=True)
                 
                 with col2:
-                    # 箱线图
+                    # 箱线图（服务端预计算分位数）
+                    q_min, q1, median, q3, q_max = np.quantile(vals, [0, 0.25, 0.5, 0.75, 1])
                     fig_box = go.Figure()
-                    fig_box.add_trace(go.Box(y=df[selected_col], name=selected_col))
+                    fig_box.add_trace(go.Box(
+                        q1=[q1], median=[median], q3=[q3],
+                        lowerfence=[q_min], upperfence=[q_max],
+                        name=selected_col
+                    ))
                     fig_box.update_layout(
                         title=f"{selected_col} 箱线图",
                         yaxis_title=selected_col,
@@ -598,7 +683,7 @@ def analyze_data():
     
     elif analysis_type == "相关性分析":
         # 选择数据组
-        group_names = [dg.get('name', f'数据组 {i+1}') for i, dg in enumerate(datagroups)]
+        group_names = _group_names(exp_data)
         selected_idx = st.selectbox("选择数据组", range(len(group_names)), 
                                    format_func=lambda x: group_names[x])
         
@@ -633,23 +718,32 @@ def analyze_data():
                 
                 # 显示强相关对
                 st.markdown("### 强相关变量对（|r| > 0.7）")
-                strong_corr = []
-                for i in range(len(corr_matrix.columns)):
-                    for j in range(i+1, len(corr_matrix.columns)):
-                        corr_val = corr_matrix.iloc[i, j]
-                        if abs(corr_val) > 0.7:
-                            strong_corr.append({
-                                '变量1': corr_matrix.columns[i],
-                                '变量2': corr_matrix.columns[j],
-                                '相关系数': corr_val
-                            })
+                # 上三角（不含对角线）一次性向量化筛选
+                vals = corr_matrix.to_numpy()
+                iu = np.triu_indices_from(vals, k=1)
+                upper = vals[iu]
+                mask = np.abs(upper) > 0.7
+                cols = corr_matrix.columns.to_numpy()
+                strong_corr = pd.DataFrame({
+                    '变量1': cols[iu[0][mask]],
+                    '变量2': cols[iu[1][mask]],
+                    '相关系数': upper[mask]
+                })
                 
-                if strong_corr:
-                    st.dataframe(pd.DataFrame(strong_corr), hide_index=True)
+                if not strong_corr.empty:
+                    st.dataframe(strong_corr, hide_index=True)
                 else:
                     st.info("没有发现强相关的变量对")
 
 
+def convert_column(converter, conversion_type, values, from_unit, to_unit):
+    """整列单位转换：温度/压力换算都是仿射变换，先由两点求出系数，再一次性向量化计算"""
+    convert = converter.temperature if conversion_type == "温度" else converter.pressure
+    offset = convert(0.0, from_unit, to_unit)
+    scale = convert(1.0, from_unit, to_unit) - offset
+    return np.asarray(values, dtype=np.float64) * scale + offset
+
+
 def convert_data():
     """数据转换"""
     st.header("🔄 数据转换")
@@ -689,6 +783,36 @@ def convert_data():
         if st.button("转换"):
             result = converter.pressure(value, from_unit, to_unit)
             st.success(f"{value} {from_unit} = {result:.6f} {to_unit}")
+    
+    # 批量转换已加载数据组中的整列
+    if conversion_type in ("温度", "压力") and st.session_state.experiment_loaded \
+            and st.session_state.current_experiment:
+        exp_data = st.session_state.current_experiment
+        # 保留原始序号，使选项标签与其它页面的数据组名称一致
+        options = [(i, dg) for i, dg in enumerate(exp_data.get('datagroups', []))
+                   if dg.get('data_df') is not None]
+        if options:
+            group_names = _group_names(exp_data)
+            st.markdown("---")
+            st.subheader("批量转换数据列")
+            st.caption(f"使用上方选择的单位：{from_unit} → {to_unit}")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                _, dg = st.selectbox("选择数据组", options,
+                                     format_func=lambda item: group_names[item[0]],
+                                     key="batch_convert_dg")
+            df = dg['data_df']
+            with col2:
+                column = st.selectbox("选择列", df.select_dtypes(include=[np.number]).columns,
+                                      key="batch_convert_col")
+            
+            if column is not None and st.button("转换整列"):
+                converted = convert_column(converter, conversion_type, df[column].to_numpy(),
+                                           from_unit, to_unit)
+                result_df = pd.DataFrame({column: df[column].to_numpy(),
+                                          f"{column} → {to_unit}": converted})
+                st.dataframe(result_df, use_container_width=True, hide_index=True)
 
 
 def export_data():
@@ -708,16 +832,21 @@ def export_data():
     
     if export_format == "JSON":
         if st.button("生成JSON"):
-            json_str = json.dumps(exp_data, indent=2, default=str, ensure_ascii=False)
+            json_bytes = orjson.dumps(
+                _to_jsonable(exp_data),
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+                default=str
+            )
             st.download_button(
                 label="下载JSON文件",
-                data=json_str,
+                data=json_bytes,
                 file_name=f"experiment_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                 mime="application/json"
             )
             
             with st.expander("JSON预览"):
-                st.code(json_str[:2000] + "..." if len(json_str) > 2000 else json_str, 
+                json_preview = json_bytes[:2000].decode('utf-8', errors='ignore')
+                st.code(json_preview + "..." if len(json_bytes) > 2000 else json_preview, 
                        language='json')
     
     elif export_format == "CSV (所有数据组)":
@@ -725,20 +854,23 @@ def export_data():
             datagroups = exp_data.get('datagroups', [])
             
             if datagroups:
-                # 创建ZIP文件
-                with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as tmp_zip:
-                    with zipfile.ZipFile(tmp_zip.name, 'w') as zf:
-                        for i, dg in enumerate(datagroups):
-                            if 'data_df' in dg and dg['data_df'] is not None:
-                                df = dg['data_df']
-                                csv_content = df.to_csv(index=False)
-                                filename = f"{dg.get('id', f'group_{i+1}')}_{dg.get('name', 'data')}.csv"
-                                zf.writestr(filename, csv_content)
-                    
-                    with open(tmp_zip.name, 'rb') as f:
-                        zip_data = f.read()
-                    
-                    os.unlink(tmp_zip.name)
+                # 各数据组并行生成CSV（Arrow写出时释放GIL）
+                def _group_csv(item):
+                    i, dg = item
+                    if dg.get('data_df') is None:
+                        return None
+                    filename = f"{dg.get('id', f'group_{i+1}')}_{dg.get('name', 'data')}.csv"
+                    return filename, fast_csv(dg['data_df'])
+                
+                with ThreadPoolExecutor(max_workers=min(8, len(datagroups))) as executor:
+                    csv_files = [r for r in executor.map(_group_csv, enumerate(datagroups)) if r]
+                
+                # 在内存中创建ZIP文件
+                buf = io.BytesIO()
+                with zipfile.ZipFile(buf, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+                    for filename, csv_content in csv_files:
+                        zf.writestr(filename, csv_content)
+                zip_data = buf.getvalue()
                 
                 st.download_button(
                     label="下载所有CSV (ZIP)",
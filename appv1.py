@@ -13,19 +13,36 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 from datetime import datetime
-import json
+import copy
+import hashlib
+import io
+import orjson
 import tempfile
+import traceback
 import zipfile
 from pathlib import Path
-import xml.etree.ElementTree as ET
-import xml.dom.minidom as minidom
+from lxml import etree as ET
 
 # 导入必要的模块
 from utils.xml_parser import parse_experiment_xml, validate_xml_structure
 from utils.converters import UnitConverter
+from utils.helpers import (downsample_for_plot, fast_csv, narrow_float, series_stats,
+                           to_jsonable, write_indented)
 from utils.constants import *
 
+# 常量选项列表在导入时生成一次，避免每次重跑重新构造
+_REACTOR_KEYS = tuple(REACTOR_TYPES.keys())
+_SPECIES_KEYS = tuple(COMMON_SPECIES.keys())
+_IGNITION_KEYS = tuple(IGNITION_TYPES.keys())
+_DIAG_KEYS = tuple(DIAGNOSTIC_METHODS.keys())
+_SPECIES_OPTIONS = ("自定义",) + _SPECIES_KEYS
+_Y_SPECIES_OPTIONS = ("无",) + _SPECIES_KEYS
+_IGNITION_OPTIONS = ("无",) + _IGNITION_KEYS
+
 # 页面配置
 st.set_page_config(
     page_title="燃烧实验数据管理系统",
@@ -50,6 +67,20 @@ if 'data_groups_new' not in st.session_state:
 if 'current_dg_columns' not in st.session_state:
     st.session_state.current_dg_columns = []
 
+# "清除所有数据"时各状态的重置值（可变对象赋值时复制，避免共享）
+_RESET = {
+    'current_experiment': None,
+    'experiment_loaded': False,
+    'new_exp_data': {},
+    'composition_list': [],
+    'optional_params': {},
+    'data_groups_new': [],
+    'current_dg_columns': [],
+}
+
+# 绘图时每条曲线的最大点数
+MAX_PLOT_POINTS = 1000
+
 
 def main():
     """主函数"""
@@ -84,15 +115,8 @@ def main():
         
         # 快速操作
         if st.button("🗑️ 清除所有数据", use_container_width=True):
-            for key in ['current_experiment', 'new_exp_data', 'composition_list', 
-                       'optional_params', 'data_groups_new', 'current_dg_columns']:
-                if key in st.session_state:
-                    if key in ['current_experiment']:
-                        st.session_state[key] = None
-                    elif key == 'experiment_loaded':
-                        st.session_state[key] = False
-                    else:
-                        st.session_state[key] = [] if key != 'new_exp_data' and key != 'optional_params' else {}
+            for key, value in _RESET.items():
+                st.session_state[key] = copy.copy(value)
             st.rerun()
         
         st.markdown("---")
@@ -140,120 +164,97 @@ def create_new_experiment():
         generate_xml_enhanced()
 
 
+def _save_and_rerun(key, message):
+    """记录保存提示并整页重跑，使其他标签页的fragment读取到最新数据"""
+    st.session_state[f'_saved_msg_{key}'] = message
+    st.rerun()
+
+
+def _show_saved_message(key):
+    """显示保存后重跑前留下的提示"""
+    message = st.session_state.pop(f'_saved_msg_{key}', None)
+    if message:
+        st.success(message)
+
+
+@st.fragment
 def create_basic_info():
-    """创建基本信息"""
+    """创建基本信息（fragment：控件交互只重跑本标签页）"""
     st.subheader("📋 基本信息")
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        # 作者信息
-        author = st.text_input("作者姓名 *", key="new_author", 
-                               placeholder="例如: John Smith")
-        doi = st.text_input("DOI (可选)", key="new_doi",
-                           placeholder="10.1234/example.2024")
+    # 表单内的输入只在提交时触发一次重跑
+    with st.form("basic_info_form"):
+        col1, col2 = st.columns(2)
         
-        # 实验类型
-        exp_type = st.selectbox(
-            "实验类型 *",
-            EXPERIMENT_TYPES,
-            key="new_exp_type"
-        )
+        with col1:
+            # 作者信息
+            author = st.text_input("作者姓名 *", key="new_author", 
+                                   placeholder="例如: John Smith")
+            doi = st.text_input("DOI (可选)", key="new_doi",
+                               placeholder="10.1234/example.2024")
+            
+            # 实验类型
+            exp_type = st.selectbox(
+                "实验类型 *",
+                EXPERIMENT_TYPES,
+                key="new_exp_type"
+            )
+            
+            # 反应器类型
+            reactor = st.selectbox(
+                "反应器类型 *",
+                _REACTOR_KEYS,
+                format_func=lambda x: REACTOR_TYPES[x],
+                key="new_reactor"
+            )
         
-        # 反应器类型
-        reactor = st.selectbox(
-            "反应器类型 *",
-            list(REACTOR_TYPES.keys()),
-            format_func=lambda x: REACTOR_TYPES[x],
-            key="new_reactor"
-        )
-    
-    with col2:
-        # 描述
-        description = st.text_area(
-            "实验描述",
-            height=100,
-            key="new_description",
-            placeholder="详细描述实验条件和目的..."
-        )
+        with col2:
+            # 描述
+            description = st.text_area(
+                "实验描述",
+                height=100,
+                key="new_description",
+                placeholder="详细描述实验条件和目的..."
+            )
+            
+            # 参考文献
+            st.markdown("**参考文献（可选）**")
+            ref_author = st.text_input("文献作者", key="ref_author")
+            ref_title = st.text_input("文献标题", key="ref_title")
+            ref_journal = st.text_input("期刊", key="ref_journal")
+            ref_year = st.number_input("年份", min_value=1900, max_value=2100, value=2024, key="ref_year")
+            ref_doi = st.text_input("文献DOI", key="ref_doi")
         
-        # 参考文献
-        st.markdown("**参考文献（可选）**")
-        ref_author = st.text_input("文献作者", key="ref_author")
-        ref_title = st.text_input("文献标题", key="ref_title")
-        ref_journal = st.text_input("期刊", key="ref_journal")
-        ref_year = st.number_input("年份", min_value=1900, max_value=2100, value=2024, key="ref_year")
-        ref_doi = st.text_input("文献DOI", key="ref_doi")
-    
-    # 保存基本信息
-    if st.button("保存基本信息", type="primary", key="save_basic"):
-        if author and exp_type and reactor:
-            st.session_state.new_exp_data['basic_info'] = {
-                'author': author,
-                'doi': doi,
-                'exp_type': exp_type,
-                'reactor': reactor,
-                'description': description,
-                'reference': {
-                    'author': ref_author,
-                    'title': ref_title,
-                    'journal': ref_journal,
-                    'year': ref_year,
-                    'doi': ref_doi
+        # 保存基本信息
+        if st.form_submit_button("保存基本信息", type="primary"):
+            if author and exp_type and reactor:
+                st.session_state.new_exp_data['basic_info'] = {
+                    'author': author,
+                    'doi': doi,
+                    'exp_type': exp_type,
+                    'reactor': reactor,
+                    'description': description,
+                    'reference': {
+                        'author': ref_author,
+                        'title': ref_title,
+                        'journal': ref_journal,
+                        'year': ref_year,
+                        'doi': ref_doi
+                    }
                 }
-            }
-            st.success("✅ 基本信息已保存")
-        else:
-            st.error("请填写所有必填项（带*号）")
+                _save_and_rerun('basic_info', "✅ 基本信息已保存")
+            else:
+                st.error("请填写所有必填项（带*号）")
+        _show_saved_message('basic_info')
 
 
+@st.fragment
 def create_experimental_conditions():
-    """创建实验条件 - 必需参数"""
+    """创建实验条件 - 必需参数（fragment：控件交互只重跑本标签页）"""
     st.subheader("⚙️ 实验条件（必需参数）")
     
-    # 温度和压力
-    st.markdown("### 🌡️ 基本参数")
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        temp = st.number_input("温度 *", min_value=0.0, value=300.0, key="new_temp")
-        temp_unit = st.selectbox("温度单位", UNITS['temperature'], key="new_temp_unit")
-    
-    with col2:
-        pressure = st.number_input("压力 *", min_value=0.0, value=1.0, key="new_pressure")
-        pressure_unit = st.selectbox("压力单位", UNITS['pressure'], key="new_pressure_unit")
-    
-    with col3:
-        # 根据反应器类型显示必需参数
-        reactor = st.session_state.new_exp_data.get('basic_info', {}).get('reactor', 'JSR')
-        required_params = get_required_params_for_reactor(reactor)
-        
-        st.markdown(f"**{reactor} 特定参数**")
-        reactor_params = {}
-        
-        if 'residence_time' in required_params:
-            reactor_params['residence_time'] = st.number_input(
-                "停留时间 (s)", min_value=0.0, value=1.0, key="residence_time")
-        
-        if 'volume' in required_params:
-            reactor_params['volume'] = st.number_input(
-                "体积 (cm³)", min_value=0.0, value=100.0, key="volume")
-        
-        if 'flow_rate' in required_params:
-            reactor_params['flow_rate'] = st.number_input(
-                "流量 (sccm)", min_value=0.0, value=100.0, key="flow_rate")
-        
-        if 'length' in required_params:
-            reactor_params['length'] = st.number_input(
-                "长度 (cm)", min_value=0.0, value=10.0, key="length")
-        
-        if 'diameter' in required_params:
-            reactor_params['diameter'] = st.number_input(
-                "直径 (cm)", min_value=0.0, value=1.0, key="diameter")
-        
-        if 'ignition_delay' in required_params:
-            reactor_params['ignition_delay'] = st.number_input(
-                "点火延迟 (ms)", min_value=0.0, value=1.0, key="ignition_delay")
+    # 反应器类型只读取一次
+    reactor = (st.session_state.new_exp_data.get('basic_info') or {}).get('reactor', 'JSR')
     
     # 初始组分
     st.markdown("### 🧪 初始组分 *")
@@ -263,7 +264,7 @@ def create_experimental_conditions():
     with col1:
         species = st.selectbox(
             "物种",
-            ["自定义"] + list(COMMON_SPECIES.keys()),
+            _SPECIES_OPTIONS,
             key="species_select"
         )
         if species == "自定义":
@@ -302,110 +303,166 @@ def create_experimental_conditions():
     # 显示当前组分
     if st.session_state.composition_list:
         st.markdown("**当前组分：**")
-        comp_df = pd.DataFrame(st.session_state.composition_list)
+        comps = st.session_state.composition_list
         
         # 编辑和删除功能
         col1, col2 = st.columns([4, 1])
         with col1:
-            st.dataframe(comp_df[['species', 'amount', 'units']], use_container_width=True)
+            # 直接以列字典渲染，无需构造DataFrame
+            st.dataframe({k: [c[k] for c in comps] for k in ('species', 'amount', 'units')},
+                         use_container_width=True)
         with col2:
             if st.button("🗑️ 清除所有", key="clear_comp"):
                 st.session_state.composition_list = []
                 st.rerun()
         
         # 验证组分总和
-        if all(c['units'] == 'mole_fraction' for c in st.session_state.composition_list):
-            total = sum(c['amount'] for c in st.session_state.composition_list)
+        if {c['units'] for c in comps} == {'mole_fraction'}:
+            amounts = np.fromiter((c['amount'] for c in comps), dtype=np.float64, count=len(comps))
+            total = amounts.sum()
             if abs(total - 1.0) > 0.01:
                 st.warning(f"⚠️ 摩尔分数总和为 {total:.4f}，应该为 1.0")
     
-    # 保存实验条件
-    if st.button("保存实验条件", type="primary", key="save_conditions"):
-        if temp > 0 and pressure > 0 and st.session_state.composition_list:
-            conditions = {
-                'temperature': {'value': temp, 'units': temp_unit},
-                'pressure': {'value': pressure, 'units': pressure_unit},
-                'composition': st.session_state.composition_list,
-                'reactor_params': reactor_params
-            }
+    # 基本参数放在表单中，只在提交时触发一次重跑（添加物种按钮需在表单外）
+    with st.form("conditions_form"):
+        # 温度和压力
+        st.markdown("### 🌡️ 基本参数")
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            temp = st.number_input("温度 *", min_value=0.0, value=300.0, key="new_temp")
+            temp_unit = st.selectbox("温度单位", UNITS['temperature'], key="new_temp_unit")
+        
+        with col2:
+            pressure = st.number_input("压力 *", min_value=0.0, value=1.0, key="new_pressure")
+            pressure_unit = st.selectbox("压力单位", UNITS['pressure'], key="new_pressure_unit")
+        
+        with col3:
+            # 根据反应器类型显示必需参数
+            required_params = get_required_params_for_reactor(reactor)
             
-            st.session_state.new_exp_data['conditions'] = conditions
-            st.success("✅ 实验条件已保存")
-        else:
-            st.error("请填写温度、压力并至少添加一个组分")
+            st.markdown(f"**{reactor} 特定参数**")
+            reactor_params = {}
+            
+            if 'residence_time' in required_params:
+                reactor_params['residence_time'] = st.number_input(
+                    "停留时间 (s)", min_value=0.0, value=1.0, key="residence_time")
+            
+            if 'volume' in required_params:
+                reactor_params['volume'] = st.number_input(
+                    "体积 (cm³)", min_value=0.0, value=100.0, key="volume")
+            
+            if 'flow_rate' in required_params:
+                reactor_params['flow_rate'] = st.number_input(
+                    "流量 (sccm)", min_value=0.0, value=100.0, key="flow_rate")
+            
+            if 'length' in required_params:
+                reactor_params['length'] = st.number_input(
+                    "长度 (cm)", min_value=0.0, value=10.0, key="length")
+            
+            if 'diameter' in required_params:
+                reactor_params['diameter'] = st.number_input(
+                    "直径 (cm)", min_value=0.0, value=1.0, key="diameter")
+            
+            if 'ignition_delay' in required_params:
+                reactor_params['ignition_delay'] = st.number_input(
+                    "点火延迟 (ms)", min_value=0.0, value=1.0, key="ignition_delay")
+        
+        # 保存实验条件
+        if st.form_submit_button("保存实验条件", type="primary"):
+            if temp > 0 and pressure > 0 and st.session_state.composition_list:
+                conditions = {
+                    'temperature': {'value': temp, 'units': temp_unit},
+                    'pressure': {'value': pressure, 'units': pressure_unit},
+                    'composition': st.session_state.composition_list,
+                    'reactor_params': reactor_params
+                }
+                
+                st.session_state.new_exp_data['conditions'] = conditions
+                _save_and_rerun('conditions', "✅ 实验条件已保存")
+            else:
+                st.error("请填写温度、压力并至少添加一个组分")
+        _show_saved_message('conditions')
 
 
+@st.fragment
 def create_optional_parameters():
-    """创建可选参数"""
+    """创建可选参数（fragment：控件交互只重跑本标签页）"""
     st.subheader("🔬 可选参数")
     
     st.info("以下参数为可选，根据实验需要填写")
     
-    # 使用列布局组织参数
-    col1, col2 = st.columns(2)
+    # 反应器类型只读取一次；非激波管时反射激波参数保持为0
+    reactor = (st.session_state.new_exp_data.get('basic_info') or {}).get('reactor')
+    reflected_T = reflected_P = 0.0
     
-    with col1:
-        st.markdown("### 反应条件")
-        
-        # 当量比
-        equiv_ratio = st.number_input(
-            "当量比 (φ)", 
-            min_value=0.0, 
-            value=0.0,
-            format="%.3f",
-            help="0表示不设置",
-            key="equiv_ratio"
-        )
-        
-        # 燃料
-        fuel = st.text_input("燃料", key="fuel", placeholder="例如: CH4")
-        
-        # 氧化剂
-        oxidizer = st.text_input("氧化剂", key="oxidizer", placeholder="例如: Air")
-        
-        # 稀释气体
-        diluent = st.text_input("稀释气体", key="diluent", placeholder="例如: N2, Ar")
-        
-        # 反射激波条件（如果适用）
-        if st.session_state.new_exp_data.get('basic_info', {}).get('reactor') == 'shock_tube':
-            st.markdown("### 激波管参数")
-            reflected_T = st.number_input("反射激波温度 (K)", min_value=0.0, value=0.0, key="reflected_T")
-            reflected_P = st.number_input("反射激波压力 (atm)", min_value=0.0, value=0.0, key="reflected_P")
-    
-    with col2:
-        st.markdown("### 测量与诊断")
-        
-        # 点火判据
-        ignition_criterion = st.selectbox(
-            "点火判据",
-            ["无"] + IGNITION_CRITERIA,
-            key="ignition_criterion"
-        )
-        
-        # 点火类型
-        ignition_type = st.selectbox(
-            "点火类型",
-            ["无"] + list(IGNITION_TYPES.keys()),
-            format_func=lambda x: "无" if x == "无" else IGNITION_TYPES.get(x, x),
-            key="ignition_type_select"
-        )
-        
-        # 诊断方法
-        diagnostics = st.multiselect(
-            "诊断方法",
-            list(DIAGNOSTIC_METHODS.keys()),
-            format_func=lambda x: DIAGNOSTIC_METHODS[x],
-            key="diagnostics"
-        )
+    # 表单内的输入只在提交时触发一次重跑
+    with st.form("optional_params_form"):
+        # 使用列布局组织参数
+        col1, col2 = st.columns(2)
         
-        # 不确定度
-        uncertainty_type = st.selectbox(
-            "不确定度类型",
-            ["无"] + UNCERTAINTY_TYPES,
-            key="uncertainty_type"
-        )
+        with col1:
+            st.markdown("### 反应条件")
+            
+            # 当量比
+            equiv_ratio = st.number_input(
+                "当量比 (φ)", 
+                min_value=0.0, 
+                value=0.0,
+                format="%.3f",
+                help="0表示不设置",
+                key="equiv_ratio"
+            )
+            
+            # 燃料
+            fuel = st.text_input("燃料", key="fuel", placeholder="例如: CH4")
+            
+            # 氧化剂
+            oxidizer = st.text_input("氧化剂", key="oxidizer", placeholder="例如: Air")
+            
+            # 稀释气体
+            diluent = st.text_input("稀释气体", key="diluent", placeholder="例如: N2, Ar")
+            
+            # 反射激波条件（如果适用）
+            if reactor == 'shock_tube':
+                st.markdown("### 激波管参数")
+                reflected_T = st.number_input("反射激波温度 (K)", min_value=0.0, value=0.0, key="reflected_T")
+                reflected_P = st.number_input("反射激波压力 (atm)", min_value=0.0, value=0.0, key="reflected_P")
         
-        if uncertainty_type != "无":
+        with col2:
+            st.markdown("### 测量与诊断")
+            
+            # 点火判据
+            ignition_criterion = st.selectbox(
+                "点火判据",
+                ["无"] + IGNITION_CRITERIA,
+                key="ignition_criterion"
+            )
+            
+            # 点火类型
+            ignition_type = st.selectbox(
+                "点火类型",
+                _IGNITION_OPTIONS,
+                format_func=lambda x: "无" if x == "无" else IGNITION_TYPES.get(x, x),
+                key="ignition_type_select"
+            )
+            
+            # 诊断方法
+            diagnostics = st.multiselect(
+                "诊断方法",
+                _DIAG_KEYS,
+                format_func=lambda x: DIAGNOSTIC_METHODS[x],
+                key="diagnostics"
+            )
+            
+            # 不确定度
+            uncertainty_type = st.selectbox(
+                "不确定度类型",
+                ["无"] + UNCERTAINTY_TYPES,
+                key="uncertainty_type"
+            )
+            
+            # 表单内无法随类型选择即时显隐，始终显示，类型为"无"时忽略
             uncertainty_value = st.number_input(
                 "不确定度值 (%)", 
                 min_value=0.0, 
@@ -413,58 +470,66 @@ def create_optional_parameters():
                 value=5.0,
                 key="uncertainty_value"
             )
-    
-    # 额外备注
-    st.markdown("### 📝 备注")
-    comments = st.text_area(
-        "实验备注",
-        height=100,
-        key="exp_comments",
-        placeholder="任何额外的实验信息..."
-    )
-    
-    # 保存可选参数
-    if st.button("保存可选参数", type="primary", key="save_optional"):
-        optional = {}
-        
-        if equiv_ratio > 0:
-            optional['equivalence_ratio'] = equiv_ratio
-        if fuel:
-            optional['fuel'] = fuel
-        if oxidizer:
-            optional['oxidizer'] = oxidizer
-        if diluent:
-            optional['diluent'] = diluent
-        
-        if ignition_criterion != "无":
-            optional['ignition_criterion'] = ignition_criterion
-        if ignition_type != "无":
-            optional['ignition_type'] = ignition_type
-        
-        if diagnostics:
-            optional['diagnostics'] = diagnostics
-        
-        if uncertainty_type != "无":
-            optional['uncertainty'] = {
-                'type': uncertainty_type,
-                'value': uncertainty_value if 'uncertainty_value' in locals() else 0
-            }
-        
-        if comments:
-            optional['comments'] = comments
         
-        # 激波管特定参数
-        if 'reflected_T' in st.session_state and st.session_state.reflected_T > 0:
-            optional['reflected_shock_temperature'] = st.session_state.reflected_T
-        if 'reflected_P' in st.session_state and st.session_state.reflected_P > 0:
-            optional['reflected_shock_pressure'] = st.session_state.reflected_P
+        # 额外备注
+        st.markdown("### 📝 备注")
+        comments = st.text_area(
+            "实验备注",
+            height=100,
+            key="exp_comments",
+            placeholder="任何额外的实验信息..."
+        )
         
-        st.session_state.optional_params = optional
-        st.success(f"✅ 已保存 {len(optional)} 个可选参数")
+        # 保存可选参数
+        if st.form_submit_button("保存可选参数", type="primary"):
+            optional = {}
+            
+            if equiv_ratio > 0:
+                optional['equivalence_ratio'] = equiv_ratio
+            if fuel:
+                optional['fuel'] = fuel
+            if oxidizer:
+                optional['oxidizer'] = oxidizer
+            if diluent:
+                optional['diluent'] = diluent
+            
+            if ignition_criterion != "无":
+                optional['ignition_criterion'] = ignition_criterion
+            if ignition_type != "无":
+                optional['ignition_type'] = ignition_type
+            
+            if diagnostics:
+                optional['diagnostics'] = diagnostics
+            
+            if uncertainty_type != "无":
+                optional['uncertainty'] = {
+                    'type': uncertainty_type,
+                    'value': uncertainty_value
+                }
+            
+            if comments:
+                optional['comments'] = comments
+            
+            # 激波管特定参数
+            if reflected_T > 0:
+                optional['reflected_shock_temperature'] = reflected_T
+            if reflected_P > 0:
+                optional['reflected_shock_pressure'] = reflected_P
+            
+            st.session_state.optional_params = optional
+            _save_and_rerun('optional', f"✅ 已保存 {len(optional)} 个可选参数")
+        _show_saved_message('optional')
+
 
+@st.cache_data(show_spinner=False, max_entries=16)
+def _empty_table(n: int, cols: tuple):
+    """手动输入用的全零数据表，按 (行数, 列名) 缓存"""
+    return pd.DataFrame({c: np.zeros(n, dtype=np.float64) for c in cols})
 
+
+@st.fragment
 def manage_data_groups():
-    """管理数据组 - 支持多数据组和多列"""
+    """管理数据组 - 支持多数据组和多列（fragment：控件交互只重跑本标签页）"""
     st.subheader("📊 数据组管理")
     
     # 显示现有数据组
@@ -476,11 +541,11 @@ def manage_data_groups():
             with st.expander(f"数据组 {idx+1}: {dg['name']}", expanded=False):
                 st.write(f"**ID:** {dg['id']}")
                 st.write(f"**列数:** {len(dg['columns'])}")
-                st.write(f"**数据点:** {len(dg['data']) if 'data' in dg else 0}")
+                table = dg.get('data_table')
+                st.write(f"**数据点:** {table.num_rows if table is not None else 0}")
                 
-                if 'data' in dg and dg['data']:
-                    df = pd.DataFrame(dg['data'])
-                    st.dataframe(df.head(10), use_container_width=True)
+                if table is not None and table.num_rows:
+                    st.dataframe(table.slice(0, 10), use_container_width=True)
                 
                 # 删除按钮
                 if st.button(f"删除数据组 {idx+1}", key=f"delete_dg_{idx}"):
@@ -528,7 +593,7 @@ def manage_data_groups():
     with col2:
         y_unit = st.selectbox("单位", UNITS['composition'], key="y_unit_add")
     with col3:
-        y_species = st.selectbox("关联物种", ["无"] + list(COMMON_SPECIES.keys()), key="y_species_add")
+        y_species = st.selectbox("关联物种", _Y_SPECIES_OPTIONS, key="y_species_add")
     with col4:
         y_label = st.text_input("标签", key="y_label_add", placeholder="可选")
     with col5:
@@ -577,7 +642,7 @@ def manage_data_groups():
             
             # 创建数据表
             columns = [x_name] + [col['name'] for col in st.session_state.current_dg_columns]
-            df = pd.DataFrame(0.0, index=range(n_points), columns=columns)
+            df = _empty_table(n_points, tuple(columns))
             
             # 数据编辑器
             edited_df = st.data_editor(
@@ -603,37 +668,40 @@ def manage_data_groups():
         if st.button("解析数据", key="parse_paste"):
             if csv_text:
                 try:
-                    from io import StringIO
-                    df = pd.read_csv(StringIO(csv_text))
+                    # 首行含制表符时按TSV解析
+                    delimiter = '\t' if '\t' in csv_text.split('\n', 1)[0] else ','
+                    table = pacsv.read_csv(
+                        pa.py_buffer(csv_text.encode('utf-8')),
+                        parse_options=pacsv.ParseOptions(delimiter=delimiter)
+                    )
                     st.success("✅ 数据解析成功")
-                    st.dataframe(df.head(), use_container_width=True)
+                    st.dataframe(table.slice(0, 5), use_container_width=True)
                     
                     # 列映射
                     st.markdown("**列映射**")
                     col_mapping = {}
                     
                     # X轴映射
-                    x_map = st.selectbox(f"X轴 ({x_name}) 对应列", df.columns, key="x_map")
+                    x_map = st.selectbox(f"X轴 ({x_name}) 对应列", table.column_names, key="x_map")
                     col_mapping[x_name] = x_map
                     
                     # Y轴映射
                     for col in st.session_state.current_dg_columns:
                         y_map = st.selectbox(
                             f"{col['name']} 对应列",
-                            ["无"] + list(df.columns),
+                            ["无"] + table.column_names,
                             key=f"y_map_{col['id']}"
                         )
                         if y_map != "无":
                             col_mapping[col['name']] = y_map
                     
                     if st.button("确认映射", key="confirm_mapping"):
-                        # 根据映射创建新DataFrame
-                        new_df = pd.DataFrame()
-                        for new_col, old_col in col_mapping.items():
-                            if old_col in df.columns:
-                                new_df[new_col] = df[old_col]
+                        # 根据映射直接选取Arrow列，最后才转换为DataFrame
+                        mapped = {new_col: table.column(old_col)
+                                  for new_col, old_col in col_mapping.items()
+                                  if old_col in table.column_names}
                         
-                        data_to_save = new_df
+                        data_to_save = pa.table(mapped).to_pandas(types_mapper=pd.ArrowDtype)
                         data_ready = True
                         
                 except Exception as e:
@@ -649,9 +717,9 @@ def manage_data_groups():
         if uploaded_file:
             try:
                 if uploaded_file.name.endswith('.csv'):
-                    df = pd.read_csv(uploaded_file)
+                    df = pd.read_csv(uploaded_file, dtype_backend='pyarrow')
                 else:
-                    df = pd.read_excel(uploaded_file)
+                    df = pd.read_excel(uploaded_file, dtype_backend='pyarrow')
                 
                 st.success("✅ 文件加载成功")
                 st.dataframe(df.head(), use_container_width=True)
@@ -700,7 +768,8 @@ def manage_data_groups():
                     },
                     'y_axes': st.session_state.current_dg_columns,
                     'columns': [x_name] + [col['name'] for col in st.session_state.current_dg_columns],
-                    'data': data_to_save.to_dict('records')
+                    # 以Arrow表保存，预览和生成XML时无需再构造DataFrame
+                    'data_table': pa.Table.from_pandas(data_to_save, preserve_index=False)
                 }
                 
                 st.session_state.data_groups_new.append(datagroup)
@@ -711,8 +780,9 @@ def manage_data_groups():
                 st.error("请填写数据组名称和ID")
 
 
+@st.fragment
 def generate_xml_enhanced():
-    """生成XML文件 - 增强版"""
+    """生成XML文件 - 增强版（fragment：控件交互只重跑本标签页）"""
     st.subheader("💾 生成XML文件")
     
     # 检查数据完整性
@@ -770,7 +840,7 @@ def generate_xml_enhanced():
             
             st.write(f"**数据组数:** {len(st.session_state.data_groups_new)}")
             for dg in st.session_state.data_groups_new:
-                st.write(f"  - {dg['name']}: {len(dg['columns'])} 列, {len(dg.get('data', []))} 数据点")
+                st.write(f"  - {dg['name']}: {len(dg['columns'])} 列, {dg['data_table'].num_rows if 'data_table' in dg else 0} 数据点")
     
     # 生成按钮
     if st.button("🚀 生成XML文件", type="primary", disabled=not can_generate, key="generate_xml"):
@@ -786,15 +856,15 @@ def generate_xml_enhanced():
             )
             
             # 显示预览
-            with st.expander("XML预览（前2000字符）"):
-                st.code(xml_content[:2000] + "..." if len(xml_content) > 2000 else xml_content, 
+            with st.expander("XML预览（前2000字节）"):
+                preview = xml_content[:2000].decode('utf-8', errors='ignore')
+                st.code(preview + "..." if len(xml_content) > 2000 else preview, 
                        language='xml')
             
             st.success("✅ XML文件生成成功！")
             
         except Exception as e:
             st.error(f"❌ 生成失败: {e}")
-            import traceback
             with st.expander("错误详情"):
                 st.code(traceback.format_exc())
     
@@ -802,12 +872,22 @@ def generate_xml_enhanced():
         st.warning("⚠️ 请完成基本信息、实验条件的填写，并至少创建一个数据组")
 
 
+# speciesLink 的可选属性
+_OPT_SPECIES_KEYS = ('CAS', 'chemName', 'InChI', 'SMILES')
+
+
 def create_enhanced_xml():
-    """创建增强版XML内容"""
+    """创建增强版XML内容，返回UTF-8编码的bytes"""
+    # 一次性读取所需的session state
+    new_exp_data = st.session_state.new_exp_data
+    optional = st.session_state.optional_params
+    data_groups = st.session_state.data_groups_new
+    species_cache = {}
+    
     root = ET.Element('experiment')
     
     # 1. 文件元数据
-    basic_info = st.session_state.new_exp_data.get('basic_info', {})
+    basic_info = new_exp_data.get('basic_info', {})
     
     ET.SubElement(root, 'fileAuthor').text = basic_info.get('author', 'Unknown')
     if basic_info.get('doi'):
@@ -840,7 +920,7 @@ def create_enhanced_xml():
     
     # 4. 通用属性（必需参数和可选参数）
     common_props = ET.SubElement(root, 'commonProperties')
-    conditions = st.session_state.new_exp_data.get('conditions', {})
+    conditions = new_exp_data.get('conditions', {})
     
     # 温度
     if 'temperature' in conditions:
@@ -870,7 +950,6 @@ def create_enhanced_xml():
             ET.SubElement(param_prop, 'value').text = str(param_value)
     
     # 可选参数
-    optional = st.session_state.optional_params
     for key, value in optional.items():
         if key in ['equivalence_ratio', 'fuel', 'oxidizer', 'diluent']:
             opt_prop = ET.SubElement(common_props, 'property',
@@ -887,77 +966,135 @@ def create_enhanced_xml():
         for comp in conditions['composition']:
             comp_elem = ET.SubElement(comp_prop, 'component')
             
-            species_attrib = {'preferredKey': comp['species']}
-            if 'CAS' in comp:
-                species_attrib['CAS'] = comp['CAS']
-            if 'chemName' in comp:
-                species_attrib['chemName'] = comp['chemName']
-            if 'InChI' in comp:
-                species_attrib['InChI'] = comp['InChI']
-            if 'SMILES' in comp:
-                species_attrib['SMILES'] = comp['SMILES']
+            species_attrib = {'preferredKey': comp['species'],
+                              **{k: comp[k] for k in _OPT_SPECIES_KEYS if k in comp}}
             
             ET.SubElement(comp_elem, 'speciesLink', attrib=species_attrib)
             ET.SubElement(comp_elem, 'amount', 
                          attrib={'units': comp['units']}).text = str(comp['amount'])
     
-    # 5. 数据组
-    for dg in st.session_state.data_groups_new:
-        dg_elem = ET.SubElement(root, 'dataGroup', 
-                               attrib={'id': dg['id'], 'label': dg['name']})
-        
-        # 定义属性（列）
-        # X轴
-        x_info = dg['x_axis']
-        x_prop = ET.SubElement(dg_elem, 'property',
-                              attrib={'id': x_info['id'],
-                                     'name': x_info['name'],
-                                     'label': x_info['label'],
-                                     'units': x_info['unit'],
-                                     'sourcetype': 'digitized'})
-        
-        # Y轴
-        for y_info in dg['y_axes']:
-            y_attrib = {
-                'id': y_info['id'],
-                'name': y_info['name'],
-                'label': y_info.get('label', y_info['name']),
-                'units': y_info['unit'],
-                'sourcetype': 'digitized'
-            }
-            
-            y_prop = ET.SubElement(dg_elem, 'property', attrib=y_attrib)
+    # 5. 流式写出：文件头部分整体写出，数据组逐个元素写出后即释放，不在内存中构建整棵树
+    # 约定：子节点一律用 SubElement(父节点, ...) 在父节点内创建，不构造游离元素再 append；
+    # 只有直接交给 xf.write 的 property/dataPoint 是独立的 ET.Element，写出后即丢弃，从不挂到其他树上
+    out_buf = io.BytesIO()
+    with ET.xmlfile(out_buf, encoding='UTF-8') as xf:
+        xf.write_declaration()
+        with xf.element('experiment'):
+            for child in root:
+                write_indented(xf, child, 1)
             
-            # 如果有物种信息
-            if y_info.get('species') and y_info['species'] in COMMON_SPECIES:
-                species_info = COMMON_SPECIES[y_info['species']]
-                species_attrib = {'preferredKey': y_info['species']}
-                species_attrib.update(species_info)
-                ET.SubElement(y_prop, 'speciesLink', attrib=species_attrib)
-        
-        # 添加数据点
-        for row in dg.get('data', []):
-            dp_elem = ET.SubElement(dg_elem, 'dataPoint')
-            
-            # X值
-            x_name = x_info['name']
-            if x_name in row:
-                ET.SubElement(dp_elem, x_info['id']).text = str(row[x_name])
+            for dg in data_groups:
+                xf.write("\n    ")
+                with xf.element('dataGroup', attrib={'id': dg['id'], 'label': dg['name']}):
+                    # 定义属性（列）
+                    # X轴
+                    x_info = dg['x_axis']
+                    x_prop = ET.Element('property',
+                                        attrib={'id': x_info['id'],
+                                               'name': x_info['name'],
+                                               'label': x_info['label'],
+                                               'units': x_info['unit'],
+                                               'sourcetype': 'digitized'})
+                    write_indented(xf, x_prop, 2)
+                    
+                    # Y轴
+                    for y_info in dg['y_axes']:
+                        y_attrib = {
+                            'id': y_info['id'],
+                            'name': y_info['name'],
+                            'label': y_info.get('label', y_info['name']),
+                            'units': y_info['unit'],
+                            'sourcetype': 'digitized'
+                        }
+                        
+                        y_prop = ET.Element('property', attrib=y_attrib)
+                        
+                        # 如果有物种信息（同一物种的speciesLink属性只组装一次）
+                        sp = y_info.get('species')
+                        if sp and sp not in species_cache and sp in COMMON_SPECIES:
+                            species_cache[sp] = {'preferredKey': sp, **COMMON_SPECIES[sp]}
+                        if sp in species_cache:
+                            ET.SubElement(y_prop, 'speciesLink', attrib=species_cache[sp])
+                        
+                        write_indented(xf, y_prop, 2)
+                    
+                    # 添加数据点（X列在前，Y列随后；每列整体格式化为字符串，不逐个调用str）
+                    table = dg.get('data_table')
+                    if table is not None:
+                        tags, value_cols, valid_cols = [], [], []
+                        for info in [x_info] + dg['y_axes']:
+                            if info['name'] in table.column_names:
+                                values, valid = _column_strings(table.column(info['name']))
+                                tags.append(info['id'])
+                                value_cols.append(values)
+                                valid_cols.append(valid)
+                        
+                        # 按行以元组遍历（等价于itertuples(index=False, name=None)），按位置取值
+                        for row, row_valid in zip(zip(*value_cols), zip(*valid_cols)):
+                            dp_elem = ET.Element('dataPoint')
+                            for tag, text, ok in zip(tags, row, row_valid):
+                                # 缺失值不写入
+                                if ok:
+                                    ET.SubElement(dp_elem, tag).text = text
+                            write_indented(xf, dp_elem, 2)
+                    
+                    xf.write("\n    ")
             
-            # Y值
-            for y_info in dg['y_axes']:
-                y_name = y_info['name']
-                if y_name in row:
-                    ET.SubElement(dp_elem, y_info['id']).text = str(row[y_name])
-    
-    # 美化XML
-    xml_str = ET.tostring(root, encoding='unicode')
-    dom = minidom.parseString(xml_str)
-    pretty_xml = dom.toprettyxml(indent="    ")
+            xf.write("\n")
     
-    # 移除空行
-    lines = [line for line in pretty_xml.split('\n') if line.strip()]
-    return '\n'.join(lines)
+    return out_buf.getvalue()
+
+
+def _column_strings(column):
+    """将Arrow列整体转换为字符串列表，返回 (values, valid)，valid标记非缺失值"""
+    valid = column.is_valid().to_numpy(zero_copy_only=False)
+    # 整数列含缺失值时to_numpy会升为浮点，先填充占位值以保持整数格式
+    if column.null_count and pa.types.is_integer(column.type):
+        column = pc.fill_null(column, 0)
+    values = column.to_numpy(zero_copy_only=False).astype(str)
+    return values.tolist(), valid.tolist()
+
+
+def _with_temp_xml(xml_bytes: bytes, func):
+    """将XML内容写入临时文件并调用 func(路径)，结束后删除临时文件"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.xml') as tmp_file:
+        tmp_file.write(xml_bytes)
+        tmp_path = tmp_file.name
+    
+    try:
+        return func(tmp_path)
+    finally:
+        os.unlink(tmp_path)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _validate_xml_cached(xml_bytes: bytes):
+    """验证XML结构，按文件内容缓存，返回 (is_valid, errors)"""
+    return _with_temp_xml(xml_bytes, validate_xml_structure)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _parse_xml_cached(xml_bytes: bytes):
+    """解析XML文件，按文件内容缓存"""
+    exp_data = _with_temp_xml(xml_bytes, parse_experiment_xml)
+    if exp_data:
+        for dg in exp_data.get('datagroups', []):
+            # 统一以按列存储的data_df作为数据组唯一的数据来源
+            if dg.get('data_df') is None and dg.get('datapoints'):
+                try:
+                    dg['data_df'] = pd.DataFrame(dg['datapoints'])
+                except (ValueError, TypeError):
+                    # 无法构造成表格的数据组保留原始datapoints
+                    continue
+            if dg.get('data_df') is not None:
+                dg.pop('datapoints', None)
+    return exp_data
+
+
+@st.cache_resource
+def _get_converter():
+    """单位转换器（跨重跑复用同一实例）"""
+    return UnitConverter()
 
 
 # 保留其他原有函数不变...
@@ -985,33 +1122,29 @@ def load_experiment_file():
         # 解析按钮
         if st.button("🔄 解析文件", type="primary", use_container_width=True):
             try:
-                # 创建临时文件
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.xml') as tmp_file:
-                    tmp_file.write(uploaded_file.getvalue())
-                    tmp_path = tmp_file.name
+                file_bytes = uploaded_file.getvalue()
                 
-                # 验证XML结构
+                # 验证XML结构（相同内容直接命中缓存）
                 with st.spinner("验证文件结构..."):
-                    is_valid, errors = validate_xml_structure(tmp_path)
+                    is_valid, errors = _validate_xml_cached(file_bytes)
                 
                 if not is_valid:
                     st.error("❌ XML文件结构验证失败：")
                     for error in errors:
                         st.error(f"  • {error}")
-                    os.unlink(tmp_path)
                     return
                 
-                # 解析XML文件
+                # 解析XML文件（相同内容直接命中缓存）
                 with st.spinner("正在解析XML文件..."):
-                    exp_data = parse_experiment_xml(tmp_path)
-                
-                # 删除临时文件
-                os.unlink(tmp_path)
+                    exp_data = _parse_xml_cached(file_bytes)
                 
                 if exp_data:
-                    # 存储到session state
+                    # 存储到session state（内容哈希用作图表缓存的键）
                     st.session_state.current_experiment = exp_data
                     st.session_state.experiment_loaded = True
+                    st.session_state.experiment_key = hashlib.blake2b(
+                        file_bytes, digest_size=16
+                    ).hexdigest()
                     
                     st.success(f"✅ 成功加载实验数据！")
                     
@@ -1022,7 +1155,6 @@ def load_experiment_file():
                     
             except Exception as e:
                 st.error(f"❌ 加载文件失败: {str(e)}")
-                import traceback
                 with st.expander("查看详细错误"):
                     st.code(traceback.format_exc())
     
@@ -1050,6 +1182,7 @@ def display_experiment_summary(exp_data):
             if 'data_df' in dg and dg['data_df'] is not None:
                 total_points += len(dg['data_df'])
             elif 'datapoints' in dg:
+                # 只有加载时无法转为data_df的数据组仍保留datapoints
                 total_points += len(dg['datapoints'])
         st.metric("总数据点", total_points)
 
@@ -1208,7 +1341,7 @@ def display_data_tables(exp_data):
                 st.dataframe(df, use_container_width=True, height=400)
                 
                 # 下载选项
-                csv = df.to_csv(index=False)
+                csv = fast_csv(df)
                 st.download_button(
                     "📥 下载CSV",
                     data=csv,
@@ -1216,13 +1349,9 @@ def display_data_tables(exp_data):
                     mime="text/csv",
                     key=f"download_{group_id}"
                 )
-            elif 'datapoints' in dg and dg['datapoints']:
-                # 如果没有data_df但有datapoints，尝试创建DataFrame
-                try:
-                    df = pd.DataFrame(dg['datapoints'])
-                    st.dataframe(df, use_container_width=True, height=400)
-                except:
-                    st.info("数据格式不支持表格显示")
+            elif dg.get('datapoints'):
+                # 加载时已将可转换的datapoints转为data_df，剩余的无法以表格显示
+                st.info("数据格式不支持表格显示")
 
 
 def display_quick_preview(exp_data):
@@ -1260,10 +1389,15 @@ def display_quick_preview(exp_data):
                     y_col = st.selectbox("Y轴", available_y, key="preview_y")
                 
                 if x_col and y_col:
+                    x_plot, y_plot = downsample_for_plot(df[x_col], df[y_col], MAX_PLOT_POINTS)
+                    # 只有发送到浏览器的绘图副本在无损时降为float32，data_df保持原精度
+                    x_plot, y_plot = narrow_float(x_plot), narrow_float(y_plot)
+                    # 大数据组使用WebGL渲染
+                    trace_cls = go.Scattergl if len(df) > MAX_PLOT_POINTS else go.Scatter
                     fig = go.Figure()
-                    fig.add_trace(go.Scatter(
-                        x=df[x_col],
-                        y=df[y_col],
+                    fig.add_trace(trace_cls(
+                        x=x_plot,
+                        y=y_plot,
                         mode='lines+markers',
                         name=y_col
                     ))
@@ -1278,6 +1412,57 @@ def display_quick_preview(exp_data):
                     st.plotly_chart(fig, use_container_width=True)
 
 
+# 折线/散点图类型对应的绘图模式
+_CHART_MODES = {"折线图": 'lines', "散点图": 'markers', "折线+散点": 'lines+markers'}
+
+
+@st.cache_resource(max_entries=32)
+def _build_figure(exp_key, dg_idx, x_col, y_cols, chart_type, x_scale, y_scale,
+                  show_grid, show_legend, height, title, _df):
+    """构建可视化图表，按 (文件内容哈希, 数据组, 绘图选项) 缓存"""
+    fig = go.Figure()
+    # 大数据组使用WebGL渲染，小数据组保留SVG
+    trace_cls = go.Scattergl if len(_df) > MAX_PLOT_POINTS else go.Scatter
+    
+    for y_col in y_cols:
+        if chart_type == "柱状图":
+            fig.add_trace(go.Bar(
+                x=_df[x_col], y=_df[y_col],
+                name=y_col
+            ))
+        else:
+            # 大数据量时只绘制降采样后的代表点
+            x_plot, y_plot = downsample_for_plot(_df[x_col], _df[y_col], MAX_PLOT_POINTS)
+            x_plot, y_plot = narrow_float(x_plot), narrow_float(y_plot)
+            fig.add_trace(trace_cls(
+                x=x_plot, y=y_plot,
+                mode=_CHART_MODES[chart_type], name=y_col
+            ))
+    
+    # 更新布局
+    fig.update_layout(
+        title=title,
+        xaxis_title=x_col,
+        yaxis_title="值",
+        template="plotly_white",
+        showlegend=show_legend,
+        height=height,
+        hovermode='x unified'
+    )
+    
+    # 设置轴类型
+    if x_scale == "对数":
+        fig.update_xaxes(type="log")
+    if y_scale == "对数":
+        fig.update_yaxes(type="log")
+    
+    # 网格设置
+    fig.update_xaxes(showgrid=show_grid)
+    fig.update_yaxes(showgrid=show_grid)
+    
+    return fig
+
+
 def visualize_data():
     """数据可视化"""
     st.header("📊 数据可视化")
@@ -1336,70 +1521,21 @@ def visualize_data():
             height = st.slider("图表高度", 400, 800, 500)
     
     if y_cols:
-        # 创建图表
-        fig = go.Figure()
-        
-        for y_col in y_cols:
-            if chart_type == "折线图":
-                fig.add_trace(go.Scatter(
-                    x=df[x_col], y=df[y_col],
-                    mode='lines', name=y_col
-                ))
-            elif chart_type == "散点图":
-                fig.add_trace(go.Scatter(
-                    x=df[x_col], y=df[y_col],
-                    mode='markers', name=y_col
-                ))
-            elif chart_type == "折线+散点":
-                fig.add_trace(go.Scatter(
-                    x=df[x_col], y=df[y_col],
-                    mode='lines+markers', name=y_col
-                ))
-            elif chart_type == "柱状图":
-                fig.add_trace(go.Bar(
-                    x=df[x_col], y=df[y_col],
-                    name=y_col
-                ))
-        
-        # 更新布局
-        fig.update_layout(
-            title=dg.get('name', '数据可视化'),
-            xaxis_title=x_col,
-            yaxis_title="值",
-            template="plotly_white",
-            showlegend=show_legend,
-            height=height,
-            hovermode='x unified'
+        # 相同数据和绘图选项直接复用已构建的图表
+        fig = _build_figure(
+            st.session_state.get('experiment_key', ''), selected_idx, x_col, tuple(y_cols),
+            chart_type, x_scale, y_scale, show_grid, show_legend, height,
+            dg.get('name', '数据可视化'), df
         )
         
-        # 设置轴类型
-        if x_scale == "对数":
-            fig.update_xaxes(type="log")
-        if y_scale == "对数":
-            fig.update_yaxes(type="log")
-        
-        # 网格设置
-        fig.update_xaxes(showgrid=show_grid)
-        fig.update_yaxes(showgrid=show_grid)
-        
         st.plotly_chart(fig, use_container_width=True)
+        if len(df) > MAX_PLOT_POINTS and chart_type != "柱状图":
+            st.caption(f"数据点较多（{len(df)}），图中每条曲线最多显示 {MAX_PLOT_POINTS} 个代表点")
         
         # 数据统计
         if st.checkbox("显示统计信息"):
             st.markdown("### 📊 数据统计")
-            stats_data = []
-            for y_col in y_cols:
-                values = df[y_col].dropna()
-                stats_data.append({
-                    "数据系列": y_col,
-                    "最小值": values.min(),
-                    "最大值": values.max(),
-                    "平均值": values.mean(),
-                    "标准差": values.std(),
-                    "数据点数": len(values)
-                })
-            
-            stats_df = pd.DataFrame(stats_data)
+            stats_df = series_stats(df, y_cols)
             st.dataframe(stats_df, use_container_width=True, hide_index=True)
 
 
@@ -1474,7 +1610,7 @@ def convert_data():
     # 单位转换工具
     st.subheader("单位转换器")
     
-    converter = UnitConverter()
+    converter = _get_converter()
     
     conversion_type = st.selectbox(
         "选择转换类型",
@@ -1508,6 +1644,33 @@ def convert_data():
             st.success(f"{value} {from_unit} = {result:.6f} {to_unit}")
 
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def _make_json(exp_key, _exp_data):
+    """序列化实验数据为JSON字节，按文件内容哈希缓存"""
+    # data_df 按列展开为原始数值，避免 default=str 只导出表格的截断文本
+    return orjson.dumps(
+        to_jsonable(_exp_data),
+        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        default=str
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _make_zip(exp_key, _datagroups):
+    """将所有数据组导出为CSV并打包为ZIP，按文件内容哈希缓存"""
+    # 直接在内存中创建ZIP文件
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+        for i, dg in enumerate(_datagroups):
+            if 'data_df' in dg and dg['data_df'] is not None:
+                df = dg['data_df']
+                csv_content = fast_csv(df)
+                filename = f"{dg.get('id', f'group_{i+1}')}_{dg.get('name', 'data')}.csv"
+                zf.writestr(filename, csv_content)
+    
+    return buf.getvalue()
+
+
 def export_data():
     """数据导出"""
     st.header("📥 数据导出")
@@ -1525,16 +1688,18 @@ def export_data():
     
     if export_format == "JSON":
         if st.button("生成JSON"):
-            json_str = json.dumps(exp_data, indent=2, default=str, ensure_ascii=False)
+            json_bytes = _make_json(st.session_state.get('experiment_key', ''), exp_data)
             st.download_button(
                 label="下载JSON文件",
-                data=json_str,
+                data=json_bytes,
                 file_name=f"experiment_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                 mime="application/json"
             )
             
             with st.expander("JSON预览"):
-                st.code(json_str[:2000] + "..." if len(json_str) > 2000 else json_str, 
+                # 只解码预览部分
+                preview = json_bytes[:2000].decode('utf-8', errors='ignore')
+                st.code(preview + "..." if len(json_bytes) > 2000 else preview, 
                        language='json')
     
     elif export_format == "CSV (所有数据组)":
@@ -1542,20 +1707,7 @@ def export_data():
             datagroups = exp_data.get('datagroups', [])
             
             if datagroups:
-                # 创建ZIP文件
-                with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as tmp_zip:
-                    with zipfile.ZipFile(tmp_zip.name, 'w') as zf:
-                        for i, dg in enumerate(datagroups):
-                            if 'data_df' in dg and dg['data_df'] is not None:
-                                df = dg['data_df']
-                                csv_content = df.to_csv(index=False)
-                                filename = f"{dg.get('id', f'group_{i+1}')}_{dg.get('name', 'data')}.csv"
-                                zf.writestr(filename, csv_content)
-                    
-                    with open(tmp_zip.name, 'rb') as f:
-                        zip_data = f.read()
-                    
-                    os.unlink(tmp_zip.name)
+                zip_data = _make_zip(st.session_state.get('experiment_key', ''), datagroups)
                 
                 st.download_button(
                     label="下载所有CSV (ZIP)",
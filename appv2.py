@@ -6,19 +6,22 @@ Combustion Experiment Data Management System
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
+import pyarrow as pa
 from datetime import datetime
-import json
-import tempfile
+import orjson
+import hashlib
+import io
+import sys
 import zipfile
-import os
+from array import array
 from pathlib import Path
-import xml.etree.ElementTree as ET
-import xml.dom.minidom as minidom
-from typing import Dict, List, Any, Optional, Union
+from types import MappingProxyType
+from lxml import etree
+from typing import IO, Dict, List, Any, Optional, Union
 import logging
 
+from utils.helpers import downsample_for_plot, narrow_float, to_jsonable, write_indented
+
 # ==================== 设置日志 ====================
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -55,6 +58,8 @@ COMMON_SPECIES = {
     'Ar': {'CAS': '7440-37-1', 'chemName': 'argon', 'InChI': '1S/Ar', 'SMILES': '[Ar]'},
     'He': {'CAS': '7440-59-7', 'chemName': 'helium', 'InChI': '1S/He', 'SMILES': '[He]'},
 }
+# 只读视图，防止调用方改写模块常量
+COMMON_SPECIES = {k: MappingProxyType(v) for k, v in COMMON_SPECIES.items()}
 
 # 单位类型
 UNITS = {
@@ -69,11 +74,11 @@ UNITS = {
 
 # 必需参数
 REQUIRED_PARAMS = {
-    'JSR': ['temperature', 'pressure', 'residence_time', 'volume'],
-    'FR': ['temperature', 'pressure', 'flow_rate', 'length', 'diameter'],
-    'shock_tube': ['temperature', 'pressure', 'ignition_delay'],
-    'RCM': ['compressed_temperature', 'compressed_pressure', 'ignition_delay'],
-    'default': ['temperature', 'pressure', 'composition']
+    'JSR': ('temperature', 'pressure', 'residence_time', 'volume'),
+    'FR': ('temperature', 'pressure', 'flow_rate', 'length', 'diameter'),
+    'shock_tube': ('temperature', 'pressure', 'ignition_delay'),
+    'RCM': ('compressed_temperature', 'compressed_pressure', 'ignition_delay'),
+    'default': ('temperature', 'pressure', 'composition')
 }
 
 # 实验类型
@@ -118,6 +123,10 @@ UNCERTAINTY_TYPES = [
     'percentage',
 ]
 
+# 绘图降采样：超过阈值的曲线用LTTB选出代表点
+MAX_PLOT_POINTS = 5000
+DOWNSAMPLE_POINTS = 2000
+
 OPTIONAL_PARAMS = [
     'equivalence_ratio',
     'phi',
@@ -129,28 +138,66 @@ OPTIONAL_PARAMS = [
 
 def get_required_params_for_reactor(reactor_type):
     """根据反应器类型获取必需参数"""
-    return REQUIRED_PARAMS.get(reactor_type, REQUIRED_PARAMS.get('default', []))
+    return REQUIRED_PARAMS.get(reactor_type) or REQUIRED_PARAMS['default']
 
 # ==================== XML解析器 ====================
 
+# 解析器安全选项：不展开实体、不访问网络、不放开 libxml2 的深度和体积限制
+_SAFE_PARSE_OPTIONS = {'resolve_entities': False, 'no_network': True, 'huge_tree': False}
+
+def _xml_source(source: Union[str, bytes, IO]) -> Union[str, IO]:
+    """把路径、字节或文件对象转成可供 iterparse 从头读取的输入"""
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return source
+
 class XMLParser:
     """XML解析器类"""
     
     def __init__(self):
         self.namespaces = {}
+        # 预编译后代搜索路径，解析多个文件时复用；简单子元素路径仍用 findall
+        self._x_datagroups = etree.XPath('.//dataGroup')
     
-    def parse_file(self, file_path: str) -> Dict[str, Any]:
-        """解析XML文件"""
+    def parse_file(self, source: Union[str, bytes, IO]) -> Dict[str, Any]:
+        """解析XML文件（路径、字节或文件对象）"""
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            return self.parse_experiment(root)
+            # 第一遍：只解析到第一个 dataGroup 开始，头部元素此时已完整
+            root = None
+            for _, elem in etree.iterparse(_xml_source(source), events=('start',), **_SAFE_PARSE_OPTIONS):
+                if root is None:
+                    root = elem
+                elif elem.tag == 'dataGroup':
+                    break
+            
+            exp_data = self.parse_header(root)
+            
+            # 第二遍：逐个流式解析 dataGroup，处理完立即释放
+            exp_data['datagroups'] = []
+            for _, dg in etree.iterparse(_xml_source(source), events=('end',), tag='dataGroup', **_SAFE_PARSE_OPTIONS):
+                exp_data['datagroups'].append(self.parse_datagroup(dg))
+                dg.clear()
+                while dg.getprevious() is not None:
+                    del dg.getparent()[0]
+            
+            exp_data['_total_points'] = self._count_points(exp_data['datagroups'])
+            return exp_data
         except Exception as e:
             logger.error(f"解析XML文件失败: {e}")
             raise
     
-    def parse_experiment(self, root: ET.Element) -> Dict[str, Any]:
+    def parse_experiment(self, root: etree._Element) -> Dict[str, Any]:
         """解析实验根节点"""
+        exp_data = self.parse_header(root)
+        exp_data['datagroups'] = self.parse_datagroups(root)
+        exp_data['_total_points'] = self._count_points(exp_data['datagroups'])
+        
+        return exp_data
+    
+    def parse_header(self, root: etree._Element) -> Dict[str, Any]:
+        """解析数据组之前的头部信息"""
         exp_data = {}
         
         exp_data['metadata'] = self.parse_metadata(root)
@@ -158,29 +205,32 @@ class XMLParser:
         exp_data['apparatus'] = self.parse_apparatus(root)
         exp_data['bibliography'] = self.parse_bibliography(root)
         exp_data['common_properties'] = self.parse_common_properties(root)
-        exp_data['datagroups'] = self.parse_datagroups(root)
+        # 预先整理为 (参数, 值, 单位) 三列，详情页直接构造表格
+        exp_data['_prop_rows'] = self._property_rows(exp_data['common_properties'])
         
         return exp_data
     
-    def parse_metadata(self, root: ET.Element) -> Dict[str, Any]:
+    def parse_metadata(self, root: etree._Element) -> Dict[str, Any]:
         """解析文件元数据"""
+        children = self._child_map(root)
         metadata = {}
-        metadata['author'] = self._get_text(root, 'fileAuthor')
-        metadata['doi'] = self._get_text(root, 'fileDOI')
+        metadata['author'] = self._child_text(children, 'fileAuthor')
+        metadata['doi'] = self._child_text(children, 'fileDOI')
         
-        file_version = root.find('fileVersion')
+        file_version = children.get('fileVersion')
         if file_version is not None:
+            version = self._child_map(file_version)
             metadata['version'] = {
-                'major': self._get_text(file_version, 'major'),
-                'minor': self._get_text(file_version, 'minor')
+                'major': self._child_text(version, 'major'),
+                'minor': self._child_text(version, 'minor')
             }
         
-        metadata['first_publication'] = self._get_text(root, 'firstPublicationDate')
-        metadata['last_modification'] = self._get_text(root, 'lastModificationDate')
+        metadata['first_publication'] = self._child_text(children, 'firstPublicationDate')
+        metadata['last_modification'] = self._child_text(children, 'lastModificationDate')
         
         return metadata
     
-    def parse_apparatus(self, root: ET.Element) -> Dict[str, Any]:
+    def parse_apparatus(self, root: etree._Element) -> Dict[str, Any]:
         """解析实验设备信息"""
         apparatus = {}
         app_elem = root.find('apparatus')
@@ -189,26 +239,28 @@ class XMLParser:
             apparatus['type'] = app_elem.get('type', '')
         return apparatus
     
-    def parse_bibliography(self, root: ET.Element) -> Dict[str, Any]:
+    def parse_bibliography(self, root: etree._Element) -> Dict[str, Any]:
         """解析文献信息"""
         bibliography = {}
         bib_elem = root.find('bibliographyLink')
         if bib_elem is not None:
-            bibliography['description'] = self._get_text(bib_elem, 'description')
-            bibliography['doi'] = self._get_text(bib_elem, 'referenceDOI')
+            children = self._child_map(bib_elem)
+            bibliography['description'] = self._child_text(children, 'description')
+            bibliography['doi'] = self._child_text(children, 'referenceDOI')
             
-            details = bib_elem.find('details')
+            details = children.get('details')
             if details is not None:
+                details = self._child_map(details)
                 bibliography['details'] = {
-                    'author': self._get_text(details, 'author'),
-                    'journal': self._get_text(details, 'journal'),
-                    'title': self._get_text(details, 'title'),
-                    'year': self._get_text(details, 'year'),
+                    'author': self._child_text(details, 'author'),
+                    'journal': self._child_text(details, 'journal'),
+                    'title': self._child_text(details, 'title'),
+                    'year': self._child_text(details, 'year'),
                 }
         
         return bibliography
     
-    def parse_common_properties(self, root: ET.Element) -> Dict[str, Any]:
+    def parse_common_properties(self, root: etree._Element) -> Dict[str, Any]:
         """解析通用属性"""
         properties = {}
         common_props = root.find('commonProperties')
@@ -216,6 +268,24 @@ class XMLParser:
         if common_props is not None:
             for prop in common_props.findall('property'):
                 name = prop.get('name', '')
+                
+                # 初始组分在同一遍遍历中就地解析
+                if name == 'initial composition':
+                    composition = {}
+                    for component in prop.findall('component'):
+                        species_link = component.find('speciesLink')
+                        amount = component.find('amount')
+                        
+                        if species_link is not None and amount is not None:
+                            species_key = species_link.get('preferredKey', '')
+                            composition[species_key] = {
+                                'amount': float(amount.text) if amount.text else 0,
+                                'units': amount.get('units', ''),
+                            }
+                    
+                    properties['initial_composition'] = composition
+                    continue
+                
                 label = prop.get('label', '')
                 units = prop.get('units', '')
                 
@@ -235,159 +305,190 @@ class XMLParser:
                     'units': units,
                     'name': name,
                 }
-            
-            # 解析初始组分
-            initial_comp = common_props.find(".//property[@name='initial composition']")
-            if initial_comp is not None:
-                composition = {}
-                for component in initial_comp.findall('component'):
-                    species_link = component.find('speciesLink')
-                    amount = component.find('amount')
-                    
-                    if species_link is not None and amount is not None:
-                        species_key = species_link.get('preferredKey', '')
-                        composition[species_key] = {
-                            'amount': float(amount.text) if amount.text else 0,
-                            'units': amount.get('units', ''),
-                        }
-                
-                properties['initial_composition'] = composition
         
         return properties
     
-    def parse_datagroups(self, root: ET.Element) -> List[Dict[str, Any]]:
+    def parse_datagroups(self, root: etree._Element) -> List[Dict[str, Any]]:
         """解析数据组"""
-        datagroups = []
-        
-        for dg in root.findall('.//dataGroup'):
-            dg_data = {
-                'id': dg.get('id', ''),
-                'label': dg.get('label', ''),
-                'properties': [],
-                'property_map': {},
-                'datapoints': [],
-                'data_df': None
+        return [self.parse_datagroup(dg) for dg in self._x_datagroups(root)]
+    
+    def parse_datagroup(self, dg: etree._Element) -> Dict[str, Any]:
+        """解析单个数据组"""
+        dg_data = {
+            'id': dg.get('id', ''),
+            'label': dg.get('label', ''),
+            'properties': [],
+            'property_map': {},
+            'data_df': None
+        }
+        
+        property_map = {}
+        used_names = set()
+        
+        for prop in dg.findall('property'):
+            prop_id = prop.get('id')
+            prop_info = {
+                'id': prop_id,
+                'name': prop.get('name', ''),
+                'label': prop.get('label', ''),
+                'units': prop.get('units', ''),
             }
             
-            property_map = {}
-            column_order = []
-            
-            for prop in dg.findall('property'):
-                prop_id = prop.get('id')
-                prop_info = {
-                    'id': prop_id,
-                    'name': prop.get('name', ''),
-                    'label': prop.get('label', ''),
-                    'units': prop.get('units', ''),
+            species_link = prop.find('speciesLink')
+            if species_link is not None:
+                prop_info['species'] = {
+                    'preferredKey': species_link.get('preferredKey', ''),
                 }
-                
-                species_link = prop.find('speciesLink')
-                if species_link is not None:
-                    prop_info['species'] = {
-                        'preferredKey': species_link.get('preferredKey', ''),
-                    }
-                    column_name = f"{prop_info['species']['preferredKey']} ({prop_info['units']})"
+                column_name = f"{prop_info['species']['preferredKey']} ({prop_info['units']})"
+            else:
+                if prop_info['label']:
+                    column_name = f"{prop_info['label']} ({prop_info['units']})" if prop_info['units'] else prop_info['label']
                 else:
-                    if prop_info['label']:
-                        column_name = f"{prop_info['label']} ({prop_info['units']})" if prop_info['units'] else prop_info['label']
-                    else:
-                        column_name = f"{prop_info['name']} ({prop_info['units']})" if prop_info['units'] else prop_info['name']
-                
-                prop_info['column_name'] = column_name
-                property_map[prop_id] = prop_info
-                column_order.append(prop_id)
-                dg_data['properties'].append(prop_info)
-            
-            dg_data['property_map'] = property_map
+                    column_name = f"{prop_info['name']} ({prop_info['units']})" if prop_info['units'] else prop_info['name']
             
-            # 解析数据点
-            data_rows = []
+            # 标签相同的属性各自成列，重名时以属性 id 区分
+            if column_name in used_names:
+                column_name = f"{column_name} [{prop_id}]"
+            used_names.add(column_name)
             
-            for dp in dg.findall('dataPoint'):
-                point_data = {}
+            prop_info['column_name'] = column_name
+            property_map[prop_id] = prop_info
+            dg_data['properties'].append(prop_info)
+        
+        dg_data['property_map'] = property_map
+        
+        # 解析数据点：按属性 id 分列缓冲，避免逐行 dict 和 DataFrame 类型推断
+        # 数值列用紧凑的 array('d') 缓冲，出现文本时该列退化为普通列表
+        bufs = {sys.intern(prop_id): array('d') for prop_id in property_map if prop_id}
+        string_cols = set()
+        nan = float('nan')
+        n_rows = 0
+        
+        for dp in dg.findall('dataPoint'):
+            filled = False
+            for child in dp:
+                tag = child.tag
+                buf = bufs.get(tag)
+                if buf is None:
+                    continue
                 
-                for child in dp:
-                    prop_id = child.tag
-                    value_text = child.text
-                    
-                    if prop_id in property_map:
-                        prop_info = property_map[prop_id]
-                        column_name = prop_info['column_name']
-                        
-                        try:
-                            value = float(value_text)
-                        except (ValueError, TypeError):
-                            value = value_text
-                        
-                        point_data[column_name] = value
+                n = len(buf)
+                if n < n_rows:
+                    buf.extend([nan] * (n_rows - n))
+                elif n > n_rows:
+                    # 同一数据点内重复的标签只保留最后一个值
+                    buf.pop()
                 
-                if point_data:
-                    dg_data['datapoints'].append(point_data)
-                    data_rows.append(point_data)
+                try:
+                    buf.append(float(child.text))
+                except ValueError:
+                    if tag not in string_cols:
+                        bufs[tag] = buf = buf.tolist()
+                        string_cols.add(tag)
+                    buf.append(child.text)
+                except TypeError:
+                    buf.append(nan)
+                filled = True
             
-            if data_rows:
-                df = pd.DataFrame(data_rows)
-                
-                display_columns = [col for col in df.columns if not col.startswith('_')]
-                ordered_columns = []
-                for prop_id in column_order:
-                    if prop_id in property_map:
-                        col_name = property_map[prop_id]['column_name']
-                        if col_name in display_columns:
-                            ordered_columns.append(col_name)
-                
-                for col in display_columns:
-                    if col not in ordered_columns:
-                        ordered_columns.append(col)
-                
-                if ordered_columns:
-                    df = df[ordered_columns]
-                
-                dg_data['data_df'] = df
-                dg_data['statistics'] = {
-                    'num_points': len(df),
-                    'columns': list(df.columns),
-                    'shape': df.shape
-                }
-                
-                logger.info(f"数据组 {dg.get('id', 'unknown')}: 解析了 {len(df)} 个数据点，{len(df.columns)} 列")
+            if filled:
+                n_rows += 1
+        
+        if n_rows:
+            columns = {}
+            for tag, buf in bufs.items():
+                col = property_map[tag]['column_name']
+                if not buf or col.startswith('_'):
+                    continue
+                buf.extend([nan] * (n_rows - len(buf)))
+                # 含文本的列交给 pandas 推断类型，纯数值列直接以缓冲区构造 float64 数组（不复制）
+                columns[col] = buf if tag in string_cols else np.frombuffer(buf, dtype=np.float64)
+            
+            df = pd.DataFrame(columns, copy=False)
+            
+            dg_data['data_df'] = df
+            dg_data['statistics'] = {
+                'num_points': len(df),
+                'columns': list(df.columns),
+                'shape': df.shape
+            }
             
-            datagroups.append(dg_data)
+            logger.info(f"数据组 {dg.get('id', 'unknown')}: 解析了 {len(df)} 个数据点，{len(df.columns)} 列")
         
-        return datagroups
+        return dg_data
+    
+    def _property_rows(self, properties: Dict[str, Any]) -> tuple:
+        """把通用属性整理为名称、值、单位三个并列元组（不含初始组分）"""
+        rows = [(key, prop.get('value', ''), prop.get('units', ''))
+                for key, prop in properties.items()
+                if key != 'initial_composition' and isinstance(prop, dict)]
+        return tuple(zip(*rows)) if rows else ((), (), ())
+    
+    def _count_points(self, datagroups: List[Dict[str, Any]]) -> int:
+        """统计所有数据组的数据点总数（加载时计算一次）"""
+        return sum(dg.get('statistics', {}).get('num_points', 0) for dg in datagroups)
+    
+    def _child_map(self, parent: etree._Element) -> Dict[str, etree._Element]:
+        """一次遍历建立子元素标签到首个同名子元素的映射"""
+        children = {}
+        for child in parent:
+            children.setdefault(child.tag, child)
+        return children
+    
+    def _child_text(self, children: Dict[str, etree._Element], tag: str, default: str = '') -> str:
+        """从子元素映射中获取文本"""
+        elem = children.get(tag)
+        if elem is not None and elem.text:
+            return elem.text.strip()
+        return default
     
-    def _get_text(self, parent: ET.Element, tag: str, default: str = '') -> str:
+    def _get_text(self, parent: etree._Element, tag: str, default: str = '') -> str:
         """获取元素文本的辅助方法"""
         elem = parent.find(tag)
         if elem is not None and elem.text:
             return elem.text.strip()
         return default
 
-def parse_experiment_xml(file_path: str) -> Dict[str, Any]:
+def parse_experiment_xml(source: Union[str, bytes, IO]) -> Dict[str, Any]:
     """解析实验XML文件的便捷函数"""
     parser = XMLParser()
-    return parser.parse_file(file_path)
+    return parser.parse_file(source)
 
-def validate_xml_structure(file_path: str) -> tuple[bool, List[str]]:
+def validate_xml_structure(source: Union[str, bytes, IO]) -> tuple[bool, List[str]]:
     """验证XML文件结构"""
     errors = []
     
     try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-        
         required_elements = ['experimentType', 'apparatus', 'commonProperties']
+        seen = set()
+        dg_count = 0
+        root = None
+        
+        # 单遍流式扫描：必需元素和首个数据组都出现后立即停止
+        for event, elem in etree.iterparse(_xml_source(source), events=('start', 'end'), **_SAFE_PARSE_OPTIONS):
+            if event == 'start':
+                if root is None:
+                    root = elem
+                elif elem.tag == 'dataGroup':
+                    dg_count += 1
+                    if seen.issuperset(required_elements):
+                        break
+                elif elem.tag in required_elements and elem.getparent() is root:
+                    seen.add(elem.tag)
+            elif elem is not root:
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+        
         for elem_name in required_elements:
-            if root.find(elem_name) is None:
+            if elem_name not in seen:
                 errors.append(f"缺少必需元素: {elem_name}")
         
-        datagroups = root.findall('.//dataGroup')
-        if not datagroups:
+        if not dg_count:
             errors.append("没有找到数据组")
         
         return len(errors) == 0, errors
         
-    except ET.ParseError as e:
+    except etree.XMLSyntaxError as e:
         errors.append(f"XML解析错误: {e}")
         return False, errors
     except Exception as e:
@@ -396,8 +497,34 @@ def validate_xml_structure(file_path: str) -> tuple[bool, List[str]]:
 
 # ==================== 单位转换器 ====================
 
+# 温度换算表：kelvin = (value + offset) * scale
+_TO_KELVIN = {
+    'K': (0.0, 1.0),
+    'C': (273.15, 1.0),
+    'F': (459.67, 5/9),
+    'R': (0.0, 5/9),
+}
+
+# 压力换算因子（到Pa）
+_TO_PA = {
+    'Pa': 1,
+    'kPa': 1000,
+    'MPa': 1e6,
+    'bar': 1e5,
+    'atm': 101325,
+    'Torr': 133.322,
+    'psi': 6894.76
+}
+
+def _unit_entry(table: Dict[str, Any], unit: str, quantity: str):
+    """查单位换算表，未知单位抛出 ValueError"""
+    try:
+        return table[unit]
+    except KeyError:
+        raise ValueError(f"未知的{quantity}单位: {unit}") from None
+
 class UnitConverter:
-    """单位转换器"""
+    """单位转换器（value 可为标量、NumPy 数组或 Series，整列转换请直接传列而非逐行循环）"""
     
     @staticmethod
     def temperature(value, from_unit: str, to_unit: str):
@@ -405,21 +532,10 @@ class UnitConverter:
         if from_unit == to_unit:
             return value
         
-        # 先转到K
-        if from_unit == 'C':
-            kelvin = value + 273.15
-        elif from_unit == 'F':
-            kelvin = (value - 32) * 5/9 + 273.15
-        else:
-            kelvin = value
-        
-        # 从K转到目标单位
-        if to_unit == 'C':
-            return kelvin - 273.15
-        elif to_unit == 'F':
-            return (kelvin - 273.15) * 9/5 + 32
-        else:
-            return kelvin
+        offset, scale = _unit_entry(_TO_KELVIN, from_unit, '温度')
+        kelvin = (value + offset) * scale
+        offset, scale = _unit_entry(_TO_KELVIN, to_unit, '温度')
+        return kelvin / scale - offset
     
     @staticmethod
     def pressure(value, from_unit: str, to_unit: str):
@@ -427,20 +543,8 @@ class UnitConverter:
         if from_unit == to_unit:
             return value
         
-        # 转换因子（到Pa）
-        to_pa = {
-            'Pa': 1,
-            'kPa': 1000,
-            'MPa': 1e6,
-            'bar': 1e5,
-            'atm': 101325,
-            'Torr': 133.322,
-            'psi': 6894.76
-        }
-        
-        # 转换
-        pa_value = value * to_pa.get(from_unit, 1)
-        return pa_value / to_pa.get(to_unit, 1)
+        pa_value = value * _unit_entry(_TO_PA, from_unit, '压力')
+        return pa_value / _unit_entry(_TO_PA, to_unit, '压力')
 
 # ==================== 页面配置 ====================
 
@@ -457,6 +561,8 @@ if 'current_experiment' not in st.session_state:
     st.session_state.current_experiment = None
 if 'experiment_loaded' not in st.session_state:
     st.session_state.experiment_loaded = False
+if 'experiment_key' not in st.session_state:
+    st.session_state.experiment_key = ''
 if 'new_exp_data' not in st.session_state:
     st.session_state.new_exp_data = {}
 if 'composition_list' not in st.session_state:
@@ -495,8 +601,9 @@ def main():
         else:
             st.info("💤 未加载数据")
         
-        if st.session_state.data_groups_new:
-            st.success(f"📊 新建数据组: {len(st.session_state.data_groups_new)}")
+        data_groups = st.session_state.data_groups_new
+        if data_groups:
+            st.success(f"📊 新建数据组: {len(data_groups)}")
         
         st.markdown("---")
         
@@ -525,6 +632,31 @@ def main():
 
 # ==================== 加载文件功能 ====================
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def _validate_xml_cached(raw: bytes) -> tuple[bool, List[str]]:
+    """验证XML结构，按文件内容缓存"""
+    return validate_xml_structure(raw)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _parse_xml_cached(raw: bytes) -> Dict[str, Any]:
+    """解析XML文件，按文件内容缓存；数据表以Arrow列式表保存"""
+    exp_data = parse_experiment_xml(raw)
+    for dg in exp_data.get('datagroups', []):
+        df = dg.pop('data_df', None)
+        dg['data_table'] = None if df is None else _to_arrow(df)
+    return exp_data
+
+def _to_arrow(df: pd.DataFrame) -> pa.Table:
+    """DataFrame转为Arrow表，数值与文本混杂的列按文本保存"""
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        df = df.copy()
+        for col in df.columns:
+            if df[col].dtype == object:
+                df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        return pa.Table.from_pandas(df, preserve_index=False)
+
 def load_experiment_file():
     """加载实验数据"""
     st.header("📂 加载实验数据")
@@ -546,28 +678,25 @@ def load_experiment_file():
         
         if st.button("🔄 解析文件", type="primary", use_container_width=True):
             try:
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.xml') as tmp_file:
-                    tmp_file.write(uploaded_file.getvalue())
-                    tmp_path = tmp_file.name
+                raw = uploaded_file.getvalue()
                 
                 with st.spinner("验证文件结构..."):
-                    is_valid, errors = validate_xml_structure(tmp_path)
+                    is_valid, errors = _validate_xml_cached(raw)
                 
                 if not is_valid:
                     st.error("❌ XML文件结构验证失败：")
                     for error in errors:
                         st.error(f"  • {error}")
-                    os.unlink(tmp_path)
                     return
                 
                 with st.spinner("正在解析XML文件..."):
-                    exp_data = parse_experiment_xml(tmp_path)
-                
-                os.unlink(tmp_path)
+                    exp_data = _parse_xml_cached(raw)
                 
                 if exp_data:
                     st.session_state.current_experiment = exp_data
                     st.session_state.experiment_loaded = True
+                    # 内容哈希用作导出缓存的键，避免对整个 exp_data 求哈希
+                    st.session_state.experiment_key = hashlib.blake2b(raw, digest_size=16).hexdigest()
                     st.success(f"✅ 成功加载实验数据！")
                     display_experiment_summary(exp_data)
                 else:
@@ -714,24 +843,25 @@ def create_experimental_conditions():
 def manage_data_groups():
     """管理数据组"""
     st.subheader("📊 数据组管理")
+    data_groups = st.session_state.data_groups_new
     
-    if st.session_state.data_groups_new:
-        st.info(f"当前有 {len(st.session_state.data_groups_new)} 个数据组")
+    if data_groups:
+        st.info(f"当前有 {len(data_groups)} 个数据组")
         
-        for idx, dg in enumerate(st.session_state.data_groups_new):
+        for idx, dg in enumerate(data_groups):
             with st.expander(f"数据组 {idx+1}: {dg['name']}", expanded=False):
                 st.write(f"**ID:** {dg['id']}")
                 st.write(f"**列数:** {len(dg.get('columns', []))}")
                 
                 if st.button(f"删除", key=f"delete_dg_{idx}"):
-                    st.session_state.data_groups_new.pop(idx)
+                    data_groups.pop(idx)
                     st.rerun()
     
     st.markdown("---")
     st.markdown("### ➕ 创建新数据组")
     
     dg_name = st.text_input("数据组名称", key="new_dg_name")
-    dg_id = st.text_input("数据组ID", value=f"dg{len(st.session_state.data_groups_new)+1}", key="new_dg_id")
+    dg_id = st.text_input("数据组ID", value=f"dg{len(data_groups)+1}", key="new_dg_id")
     
     # 简单的数据输入
     st.markdown("#### 输入数据")
@@ -741,7 +871,7 @@ def manage_data_groups():
     
     # 创建数据表
     columns = [f"Column_{i+1}" for i in range(n_cols)]
-    df = pd.DataFrame(0.0, index=range(n_rows), columns=columns)
+    df = pd.DataFrame(np.zeros((n_rows, n_cols), dtype=np.float64), columns=columns)
     
     edited_df = st.data_editor(df, use_container_width=True, key="dg_data_editor")
     
@@ -751,10 +881,10 @@ def manage_data_groups():
                 'id': dg_id,
                 'name': dg_name,
                 'columns': list(edited_df.columns),
-                'data': edited_df.to_dict('records')
+                'values': edited_df.to_numpy()
             }
             
-            st.session_state.data_groups_new.append(datagroup)
+            data_groups.append(datagroup)
             st.success(f"✅ 数据组 '{dg_name}' 已保存！")
             st.rerun()
 
@@ -762,10 +892,13 @@ def generate_xml_enhanced():
     """生成XML文件"""
     st.subheader("💾 生成XML文件")
     
+    new_exp = st.session_state.new_exp_data
+    data_groups = st.session_state.data_groups_new
+    
     # 检查数据完整性
-    has_basic = 'basic_info' in st.session_state.new_exp_data
-    has_conditions = 'conditions' in st.session_state.new_exp_data
-    has_data = bool(st.session_state.data_groups_new)
+    has_basic = 'basic_info' in new_exp
+    has_conditions = 'conditions' in new_exp
+    has_data = bool(data_groups)
     
     col1, col2, col3 = st.columns(3)
     
@@ -783,7 +916,7 @@ def generate_xml_enhanced():
     
     with col3:
         if has_data:
-            st.success(f"✅ 数据组 ({len(st.session_state.data_groups_new)})")
+            st.success(f"✅ 数据组 ({len(data_groups)})")
         else:
             st.warning("⚠️ 无数据组")
     
@@ -807,75 +940,82 @@ def generate_xml_enhanced():
 
 def create_enhanced_xml():
     """创建XML内容"""
-    root = ET.Element('experiment')
+    new_exp = st.session_state.new_exp_data
+    data_groups = st.session_state.data_groups_new
+    root = etree.Element('experiment')
     
     # 基本信息
-    basic_info = st.session_state.new_exp_data.get('basic_info', {})
+    basic_info = new_exp.get('basic_info', {})
     
-    ET.SubElement(root, 'fileAuthor').text = basic_info.get('author', 'Unknown')
-    if basic_info.get('doi'):
-        ET.SubElement(root, 'fileDOI').text = basic_info['doi']
-    
-    ET.SubElement(root, 'experimentType').text = basic_info.get('exp_type', '')
+    # (标签, 值, 是否必写)，按文档顺序写出
+    header_fields = (
+        ('fileAuthor', basic_info.get('author', 'Unknown'), True),
+        ('fileDOI', basic_info.get('doi'), False),
+        ('experimentType', basic_info.get('exp_type', ''), True),
+    )
+    for tag, value, required in header_fields:
+        if value or required:
+            etree.SubElement(root, tag).text = str(value) if value else ''
     
-    apparatus_elem = ET.SubElement(root, 'apparatus')
-    ET.SubElement(apparatus_elem, 'kind').text = basic_info.get('reactor', 'JSR')
+    apparatus_elem = etree.SubElement(root, 'apparatus')
+    etree.SubElement(apparatus_elem, 'kind').text = basic_info.get('reactor', 'JSR')
     
     # 通用属性
-    common_props = ET.SubElement(root, 'commonProperties')
-    conditions = st.session_state.new_exp_data.get('conditions', {})
-    
-    if 'temperature' in conditions:
-        temp_prop = ET.SubElement(common_props, 'property', 
-                                 attrib={'name': 'temperature',
-                                        'units': conditions['temperature']['units']})
-        ET.SubElement(temp_prop, 'value').text = str(conditions['temperature']['value'])
+    common_props = etree.SubElement(root, 'commonProperties')
+    conditions = new_exp.get('conditions', {})
     
-    if 'pressure' in conditions:
-        press_prop = ET.SubElement(common_props, 'property',
-                                   attrib={'name': 'pressure',
-                                          'units': conditions['pressure']['units']})
-        ET.SubElement(press_prop, 'value').text = str(conditions['pressure']['value'])
+    for name in ('temperature', 'pressure'):
+        if name in conditions:
+            prop = etree.SubElement(common_props, 'property',
+                                    attrib={'name': name,
+                                           'units': conditions[name]['units']})
+            etree.SubElement(prop, 'value').text = str(conditions[name]['value'])
     
     # 初始组分
     if 'composition' in conditions and conditions['composition']:
-        comp_prop = ET.SubElement(common_props, 'property',
+        comp_prop = etree.SubElement(common_props, 'property',
                                   attrib={'name': 'initial composition'})
         
         for comp in conditions['composition']:
-            comp_elem = ET.SubElement(comp_prop, 'component')
+            comp_elem = etree.SubElement(comp_prop, 'component')
             
             species_attrib = {'preferredKey': comp['species']}
             if 'CAS' in comp:
                 species_attrib['CAS'] = comp['CAS']
             
-            ET.SubElement(comp_elem, 'speciesLink', attrib=species_attrib)
-            ET.SubElement(comp_elem, 'amount', 
+            etree.SubElement(comp_elem, 'speciesLink', attrib=species_attrib)
+            etree.SubElement(comp_elem, 'amount', 
                          attrib={'units': comp['units']}).text = str(comp['amount'])
     
-    # 数据组
-    for dg in st.session_state.data_groups_new:
-        dg_elem = ET.SubElement(root, 'dataGroup', attrib={'id': dg['id']})
-        
-        # 定义属性
-        for i, col in enumerate(dg['columns']):
-            ET.SubElement(dg_elem, 'property',
-                         attrib={'id': f'x{i+1}', 'name': col})
-        
-        # 数据点
-        for row in dg.get('data', []):
-            dp_elem = ET.SubElement(dg_elem, 'dataPoint')
-            for i, col in enumerate(dg['columns']):
-                if col in row:
-                    ET.SubElement(dp_elem, f'x{i+1}').text = str(row[col])
-    
-    # 美化XML
-    xml_str = ET.tostring(root, encoding='unicode')
-    dom = minidom.parseString(xml_str)
-    pretty_xml = dom.toprettyxml(indent="    ")
+    # 流式写出：头部元素整体写出，dataPoint 逐个写出后即丢弃，不在内存中构建整棵树
+    out_buf = io.BytesIO()
+    with etree.xmlfile(out_buf, encoding='UTF-8') as xf:
+        xf.write_declaration()
+        with xf.element('experiment'):
+            for child in root:
+                write_indented(xf, child, 1)
+            
+            # 数据组
+            for dg in data_groups:
+                xf.write("\n    ")
+                with xf.element('dataGroup', attrib={'id': dg['id']}):
+                    # 定义属性
+                    for i, col in enumerate(dg['columns']):
+                        write_indented(xf, etree.Element('property', attrib={'id': f'x{i+1}', 'name': col}), 2)
+                    
+                    # 数据点（按列位置取值）
+                    tags = [f'x{i+1}' for i in range(len(dg['columns']))]
+                    for row in dg.get('values', ()):
+                        dp_elem = etree.Element('dataPoint')
+                        for tag, value in zip(tags, row):
+                            etree.SubElement(dp_elem, tag).text = str(value)
+                        write_indented(xf, dp_elem, 2)
+                    
+                    xf.write("\n    ")
+            
+            xf.write("\n")
     
-    lines = [line for line in pretty_xml.split('\n') if line.strip()]
-    return '\n'.join(lines)
+    return out_buf.getvalue()
 
 # ==================== 显示功能 ====================
 
@@ -889,16 +1029,22 @@ def display_experiment_summary(exp_data):
     with col2:
         st.metric("数据组数量", len(exp_data.get('datagroups', [])))
     with col3:
-        total_points = sum(len(dg.get('datapoints', [])) for dg in exp_data.get('datagroups', []))
-        st.metric("总数据点", total_points)
+        st.metric("总数据点", exp_data.get('_total_points', 0))
 
 def display_experiment_details(exp_data):
     """显示实验详细信息"""
     st.subheader("📊 实验数据详情")
     
-    tabs = st.tabs(["📋 基本信息", "🧪 实验条件", "📊 数据表"])
+    # 用单选代替 st.tabs：st.tabs 会在每次重跑时构建全部标签页内容，这里只构建当前选中的一页
+    active = st.radio(
+        "查看内容",
+        ["📋 基本信息", "🧪 实验条件", "📊 数据表"],
+        horizontal=True,
+        label_visibility="collapsed",
+        key="detail_view"
+    )
     
-    with tabs[0]:
+    if active == "📋 基本信息":
         if 'metadata' in exp_data:
             metadata = exp_data['metadata']
             col1, col2 = st.columns(2)
@@ -908,30 +1054,46 @@ def display_experiment_details(exp_data):
             with col2:
                 st.write(f"**版本:** {metadata.get('version', 'N/A')}")
     
-    with tabs[1]:
-        if 'common_properties' in exp_data:
-            props = exp_data['common_properties']
-            prop_data = []
-            for key, value in props.items():
-                if key != 'initial_composition' and isinstance(value, dict):
-                    prop_data.append({
-                        '参数': key,
-                        '值': value.get('value', ''),
-                        '单位': value.get('units', '')
-                    })
-            if prop_data:
-                df = pd.DataFrame(prop_data)
+    elif active == "🧪 实验条件":
+        if '_prop_rows' in exp_data:
+            names, values, units = exp_data['_prop_rows']
+            if names:
+                df = pd.DataFrame({'参数': names, '值': values, '单位': units}, copy=False)
                 st.dataframe(df, use_container_width=True, hide_index=True)
     
-    with tabs[2]:
+    elif active == "📊 数据表":
         datagroups = exp_data.get('datagroups', [])
         for i, dg in enumerate(datagroups):
             with st.expander(f"数据组 {i+1}", expanded=(i==0)):
-                if 'data_df' in dg and dg['data_df'] is not None:
-                    st.dataframe(dg['data_df'], use_container_width=True)
+                if dg.get('data_table') is not None:
+                    st.dataframe(dg['data_table'], use_container_width=True)
 
 # ==================== 数据可视化 ====================
 
+@st.cache_resource(max_entries=32)
+def _build_figure(exp_key: str, dg_idx: int, x_col: str, y_col: str, _table: pa.Table):
+    """构建数据组曲线图，按 (文件内容哈希, 数据组, 坐标轴) 缓存"""
+    # 只在真正绘图时加载 plotly，其他页面不承担导入开销
+    import plotly.graph_objects as go
+    
+    # 直接从Arrow列取NumPy数组，不经过pandas
+    x_plot = _table.column(x_col).to_numpy()
+    y_plot = _table.column(y_col).to_numpy()
+    if _table.num_rows > MAX_PLOT_POINTS:
+        # 只缩减发送到浏览器的点数，session_state 中保留完整数据
+        x_plot, y_plot = downsample_for_plot(x_plot, y_plot, DOWNSAMPLE_POINTS)
+    
+    # plotly 以二进制类型数组发送浮点列，能无损表示时用 float32，数据量减半
+    x_plot = narrow_float(x_plot)
+    y_plot = narrow_float(y_plot)
+    
+    fig = go.Figure()
+    # WebGL 渲染；传 NumPy 数组避免 Series 逐元素序列化
+    fig.add_trace(go.Scattergl(x=x_plot, y=y_plot, mode='lines+markers'))
+    fig.update_layout(xaxis_title=x_col, yaxis_title=y_col, height=400,
+                      uirevision=dg_idx)
+    return fig
+
 def visualize_data():
     """数据可视化"""
     st.header("📊 数据可视化")
@@ -951,23 +1113,40 @@ def visualize_data():
     selected_idx = st.selectbox("选择数据组", range(len(datagroups)))
     dg = datagroups[selected_idx]
     
-    if 'data_df' in dg and dg['data_df'] is not None:
-        df = dg['data_df']
+    if dg.get('data_table') is not None:
+        table = dg['data_table']
+        
+        cols = tuple(table.column_names)
         
         col1, col2 = st.columns(2)
         with col1:
-            x_col = st.selectbox("X轴", df.columns)
+            x_col = st.selectbox("X轴", cols)
         with col2:
-            y_col = st.selectbox("Y轴", [c for c in df.columns if c != x_col])
+            x_pos = cols.index(x_col)
+            y_col = st.selectbox("Y轴", cols[:x_pos] + cols[x_pos + 1:])
         
         if x_col and y_col:
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(x=df[x_col], y=df[y_col], mode='lines+markers'))
-            fig.update_layout(xaxis_title=x_col, yaxis_title=y_col, height=400)
+            # 相同文件、数据组和坐标轴直接复用已构建的图表
+            fig = _build_figure(st.session_state.experiment_key, selected_idx, x_col, y_col, table)
             st.plotly_chart(fig, use_container_width=True)
+            
+            if table.num_rows > MAX_PLOT_POINTS:
+                st.caption(f"数据点较多（{table.num_rows}），图中最多显示 {DOWNSAMPLE_POINTS} 个代表点")
 
 # ==================== 数据导出 ====================
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def _make_json(exp_key: str, _exp_data: Dict[str, Any]) -> bytes:
+    """序列化实验数据为JSON字节，按文件内容哈希缓存"""
+    # 数据表按列展开为原始数值，由 orjson 一次写出，浮点数保持完整精度
+    doc = to_jsonable(_exp_data)
+    for dg in doc.get('datagroups', []):
+        # 加载后数据表存于 data_table，导出时仍以 data_df 为键
+        columns = dg.pop('data_table', None)
+        dg['data_df'] = columns if columns is not None else dg.pop('data_df', None)
+    return orjson.dumps(doc, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+                        default=str)
+
 def export_data():
     """数据导出"""
     st.header("📥 数据导出")
@@ -979,10 +1158,10 @@ def export_data():
     exp_data = st.session_state.current_experiment
     
     if st.button("生成JSON"):
-        json_str = json.dumps(exp_data, indent=2, default=str, ensure_ascii=False)
+        json_bytes = _make_json(st.session_state.experiment_key, exp_data)
         st.download_button(
             label="下载JSON文件",
-            data=json_str,
+            data=json_bytes,
             file_name=f"experiment_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
             mime="application/json"
         )
@@ -0,0 +1,55 @@
+"""appv2 JSON导出的往返测试"""
+
+import math
+import sys
+from pathlib import Path
+
+import orjson
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import appv2  # noqa: E402
+
+SAMPLE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<experiment>
+    <fileAuthor>A</fileAuthor>
+    <experimentType>ignition delay measurement</experimentType>
+    <commonProperties>
+        <property name="pressure" units="atm"><value>10</value></property>
+    </commonProperties>
+    <dataGroup id="dg1">
+        <property id="x1" name="temperature" units="K"/>
+        <property id="x2" name="composition" units="mole fraction"><speciesLink preferredKey="CO"/></property>
+        <property id="x3" name="note"/>
+        <dataPoint><x1>1000.123456789012</x1><x2>1.234567890123e-05</x2><x3>ok</x3></dataPoint>
+        <dataPoint><x1>1100</x1><x3>bad</x3></dataPoint>
+        <dataPoint><x1>1200.5</x1><x2>3e-05</x2></dataPoint>
+    </dataGroup>
+    <dataGroup id="dg2">
+        <property id="x1" name="time" units="ms"/>
+    </dataGroup>
+</experiment>"""
+
+
+def test_json_export_round_trips_every_value():
+    exp_data = appv2._parse_xml_cached(SAMPLE)
+    doc = orjson.loads(appv2._make_json('test-round-trip', exp_data))
+
+    assert not [k for k in doc if k.startswith('_')]
+    assert doc['experiment_type'] == exp_data['experiment_type']
+    assert len(doc['datagroups']) == 2
+
+    table = exp_data['datagroups'][0]['data_table']
+    columns = doc['datagroups'][0]['data_df']
+    assert list(columns) == table.column_names
+    for name in table.column_names:
+        expected = table.column(name).to_pylist()
+        for got, want in zip(columns[name], expected, strict=True):
+            if want is None or (isinstance(want, float) and math.isnan(want)):
+                assert got is None
+            else:
+                assert got == want
+
+    assert columns['temperature (K)'][0] == 1000.123456789012
+    assert columns['CO (mole fraction)'][0] == 1.234567890123e-05
+    assert doc['datagroups'][1]['data_df'] is None
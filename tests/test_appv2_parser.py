@@ -0,0 +1,48 @@
+"""appv2 XMLParser 数据组解析的回归测试"""
+
+import math
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import appv2  # noqa: E402
+
+
+def _parse_group(body: str):
+    xml = f"""<?xml version="1.0" encoding="UTF-8"?>
+<experiment>
+    <experimentType>ignition delay measurement</experimentType>
+    <dataGroup id="dg1">{body}</dataGroup>
+</experiment>""".encode('utf-8')
+    exp_data = appv2.XMLParser().parse_file(xml)
+    return exp_data['datagroups'][0]['data_df']
+
+
+def test_duplicate_labels_become_separate_columns():
+    df = _parse_group("""
+        <property id="x1" name="temperature" label="T" units="K"/>
+        <property id="x2" name="temperature" label="T" units="K"/>
+        <dataPoint><x1>1000</x1><x2>1001</x2></dataPoint>
+        <dataPoint><x1>1100</x1><x2>1101</x2></dataPoint>
+    """)
+    assert list(df.columns) == ['T (K)', 'T (K) [x2]']
+    assert len(df) == 2
+    assert df['T (K)'].tolist() == [1000.0, 1100.0]
+    assert df['T (K) [x2]'].tolist() == [1001.0, 1101.0]
+
+
+def test_repeated_tag_in_one_point_keeps_last_value():
+    df = _parse_group("""
+        <property id="x1" name="temperature" units="K"/>
+        <property id="x2" name="pressure" units="atm"/>
+        <dataPoint><x1>1000</x1><x1>1050</x1><x2>10</x2></dataPoint>
+        <dataPoint><x2>20</x2><x2>abc</x2></dataPoint>
+        <dataPoint><x1>1200</x1><x2>30</x2></dataPoint>
+    """)
+    assert len(df) == 3
+    temperature = df['temperature (K)'].tolist()
+    assert temperature[0] == 1050.0
+    assert math.isnan(temperature[1])
+    assert temperature[2] == 1200.0
+    assert df['pressure (atm)'].tolist() == [10.0, 'abc', 30.0]
@@ -0,0 +1,54 @@
+"""appv2 UnitConverter 单位换算表的测试"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from appv2 import UnitConverter  # noqa: E402
+
+
+@pytest.mark.parametrize('value, unit, kelvin', [
+    (0.0, 'C', 273.15),
+    (100.0, 'C', 373.15),
+    (32.0, 'F', 273.15),
+    (-459.67, 'F', 0.0),
+    (491.67, 'R', 273.15),
+    (300.0, 'K', 300.0),
+])
+def test_temperature_to_kelvin(value, unit, kelvin):
+    assert UnitConverter.temperature(value, unit, 'K') == pytest.approx(kelvin)
+    assert UnitConverter.temperature(kelvin, 'K', unit) == pytest.approx(value, abs=1e-9)
+
+
+@pytest.mark.parametrize('unit, pascal', [
+    ('kPa', 1000.0),
+    ('MPa', 1e6),
+    ('bar', 1e5),
+    ('atm', 101325.0),
+    ('Torr', 133.322),
+    ('psi', 6894.76),
+])
+def test_pressure_to_pascal(unit, pascal):
+    assert UnitConverter.pressure(2.0, unit, 'Pa') == pytest.approx(2 * pascal)
+    assert UnitConverter.pressure(2 * pascal, 'Pa', unit) == pytest.approx(2.0)
+
+
+def test_conversion_accepts_arrays():
+    celsius = np.array([0.0, 100.0])
+    assert UnitConverter.temperature(celsius, 'C', 'K') == pytest.approx([273.15, 373.15])
+    assert UnitConverter.pressure(np.array([1.0, 2.0]), 'atm', 'kPa') == pytest.approx([101.325, 202.65])
+
+
+@pytest.mark.parametrize('convert, good_unit', [
+    (UnitConverter.temperature, 'K'),
+    (UnitConverter.pressure, 'Pa'),
+])
+def test_unknown_unit_raises_value_error(convert, good_unit):
+    with pytest.raises(ValueError, match='furlong'):
+        convert(1.0, 'furlong', good_unit)
+    with pytest.raises(ValueError, match='furlong'):
+        convert(1.0, good_unit, 'furlong')
@@ -0,0 +1,141 @@
+"""utils.helpers 共用辅助函数的行为测试"""
+
+import io
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import orjson
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.helpers import (  # noqa: E402
+    downsample_for_plot, fast_csv, narrow_float, series_stats, to_jsonable,
+)
+
+
+def test_downsample_keeps_short_series_unchanged():
+    x = np.arange(10.0)
+    y = x ** 2
+    x_out, y_out = downsample_for_plot(x, y, 100)
+    assert np.array_equal(x_out, x) and np.array_equal(y_out, y)
+
+
+def test_downsample_keeps_endpoints_and_peak():
+    x = np.arange(10000.0)
+    y = np.zeros_like(x)
+    y[4321] = 5.0
+    x_out, y_out = downsample_for_plot(x, y, 200)
+    assert len(x_out) == 200
+    assert x_out[0] == 0.0 and x_out[-1] == 9999.0
+    assert np.all(np.diff(x_out) > 0)
+    assert 4321.0 in x_out and y_out.max() == 5.0
+
+
+def test_downsample_drops_missing_values():
+    x = np.arange(5000.0)
+    y = np.sin(x / 50)
+    y[::7] = np.nan
+    x_out, y_out = downsample_for_plot(x, y, 500)
+    assert len(x_out) == 500
+    assert not np.isnan(y_out).any()
+
+
+def test_downsample_leaves_text_columns_alone():
+    x = np.arange(5000.0)
+    y = np.array(['a'] * 5000, dtype=object)
+    x_out, y_out = downsample_for_plot(x, y, 100)
+    assert len(x_out) == 5000 and len(y_out) == 5000
+
+
+def test_narrow_float_uses_float32_only_when_lossless():
+    exact = np.array([1.0, 0.5, 1000.25, np.nan])
+    narrowed = narrow_float(exact)
+    assert narrowed.dtype == np.float32
+    assert np.array_equal(narrowed.astype(np.float64), exact, equal_nan=True)
+
+    precise = np.array([1000.123456789, 1e-5, 0.1])
+    kept = narrow_float(precise)
+    assert kept.dtype == np.float64
+    assert np.array_equal(kept, precise)
+
+
+def test_narrow_float_passes_non_float_values_through():
+    ints = np.arange(5)
+    assert narrow_float(ints).dtype == ints.dtype
+    text = np.array(['a', 'b'], dtype=object)
+    assert narrow_float(text).tolist() == ['a', 'b']
+
+
+_JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _sample_frame():
+    return pd.DataFrame({
+        'T (K)': [1000.123456789012, 0.1 + 0.2, np.nan, 1e-300],
+        'n': [1, 2, 3, 4],
+        'note': ['ok', None, 'bad', 'ok'],
+        'kind': pd.Categorical(['a', 'b', 'a', 'a']),
+    })
+
+
+def _assert_columns_equal(columns, df):
+    assert list(columns) == list(df.columns)
+    for name in df.columns:
+        expected = df[name].astype(object).tolist()
+        got = columns[name]
+        assert len(got) == len(expected)
+        for g, e in zip(got, expected):
+            if e is None or (isinstance(e, float) and math.isnan(e)):
+                assert g is None
+            else:
+                assert g == e
+
+
+def test_to_jsonable_round_trips_every_dataframe_value():
+    df = _sample_frame()
+    exp_data = {'experiment_type': 'ignition', '_total_points': 4,
+                'datagroups': [{'id': 'dg1', 'data_df': df, 'datapoints': [{'T (K)': 1.0}]}]}
+    doc = orjson.loads(orjson.dumps(to_jsonable(exp_data), option=_JSON_OPTIONS, default=str))
+    assert '_total_points' not in doc
+    dg = doc['datagroups'][0]
+    assert dg['datapoints'] == [{'T (K)': 1.0}]
+    _assert_columns_equal(dg['data_df'], df)
+
+
+def test_to_jsonable_round_trips_arrow_tables():
+    temperature = [1000.123456789012, 0.1 + 0.2, None, 1e-300]
+    counts = [1, None, 3, 4]
+    notes = ['ok', None, 'bad', 'ok']
+    table = pa.table({'T (K)': temperature, 'n': counts, 'note': notes})
+    doc = orjson.loads(orjson.dumps(to_jsonable({'t': table}), option=_JSON_OPTIONS, default=str))
+    assert doc['t'] == {'T (K)': temperature, 'n': counts, 'note': notes}
+
+
+def test_fast_csv_round_trips_values():
+    df = pd.DataFrame({'T (K)': [1000.123456789012, np.nan, 1e-300],
+                       'n': [1, 2, 3],
+                       'note': ['ok', 'a,b', 'x']})
+    back = pd.read_csv(io.BytesIO(fast_csv(df)))
+    assert list(back.columns) == list(df.columns)
+    assert np.array_equal(back['T (K)'].to_numpy(), df['T (K)'].to_numpy(), equal_nan=True)
+    assert back['n'].tolist() == [1, 2, 3]
+    assert back['note'].tolist() == ['ok', 'a,b', 'x']
+
+
+def test_fast_csv_falls_back_for_mixed_object_columns():
+    df = pd.DataFrame({'v': pd.Series([1.5, 'abc', 3], dtype=object)})
+    back = pd.read_csv(io.BytesIO(fast_csv(df)))
+    assert back['v'].astype(str).tolist() == ['1.5', 'abc', '3']
+
+
+def test_series_stats_uses_full_precision():
+    df = pd.DataFrame({'a': [1000.1234567891, 1000.1234567893, np.nan], 'b': [1.0, 2.0, 3.0]})
+    stats = series_stats(df, ['a', 'b']).set_index('数据系列')
+    assert stats.loc['a', '平均值'] == df['a'].mean()
+    assert stats.loc['a', '标准差'] == df['a'].std()
+    assert stats.loc['a', '数据点数'] == 2
+    assert stats.loc['b', '最大值'] == 3.0
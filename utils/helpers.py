@@ -0,0 +1,113 @@
+"""
+各页面共用的数据处理辅助函数
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from lxml import etree
+
+
+def fast_csv(df) -> bytes:
+    """用PyArrow的C++写出器将DataFrame导出为CSV字节"""
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except pa.ArrowException:
+        # 混合类型的object列无法转为Arrow，退回pandas写出
+        return df.to_csv(index=False).encode('utf-8')
+    buf = io.BytesIO()
+    pacsv.write_csv(table, buf)
+    return buf.getvalue()
+
+
+def series_stats(df, cols):
+    """一次df.agg计算各数据系列的最小值、最大值、平均值、标准差和数据点数"""
+    stats_df = df[cols].agg(['min', 'max', 'mean', 'std', 'count']).T.reset_index()
+    stats_df.columns = ["数据系列", "最小值", "最大值", "平均值", "标准差", "数据点数"]
+    stats_df["数据点数"] = stats_df["数据点数"].astype(int)
+    return stats_df
+
+
+def write_indented(xf, elem, level):
+    """按缩进层级将单个元素写入lxml流式XML写出器"""
+    etree.indent(elem, space="    ", level=level)
+    xf.write("\n" + "    " * level, elem)
+
+
+def downsample_for_plot(x, y, n_out):
+    """LTTB降采样到最多 n_out 个点，保留曲线形状，返回 (x, y)"""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(x) <= n_out or n_out < 3 or x.dtype.kind not in 'fiu' or y.dtype.kind not in 'fiu':
+        return x, y
+    
+    # 缺失值不参与选点
+    mask = ~(np.isnan(x.astype(np.float64)) | np.isnan(y.astype(np.float64)))
+    x, y = x[mask], y[mask]
+    n = len(x)
+    if n <= n_out:
+        return x, y
+    
+    xf = x.astype(np.float64)
+    yf = y.astype(np.float64)
+    # 首尾点固定，中间分为 n_out-2 个桶，每桶选与前一点和下一桶均值构成三角形面积最大的点
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    idx = np.empty(n_out, dtype=np.intp)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = xf[end:next_end].mean()
+        avg_y = yf[end:next_end].mean()
+        area = np.abs((xf[a] - avg_x) * (yf[start:end] - yf[a])
+                      - (xf[a] - xf[start:end]) * (avg_y - yf[a]))
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+    return x[idx], y[idx]
+
+
+def narrow_float(values):
+    """绘图用：浮点数组在无损时降为连续 float32，否则保留原精度"""
+    values = np.asarray(values)
+    if values.dtype.kind != 'f':
+        return values
+    narrowed = np.ascontiguousarray(values, dtype=np.float32)
+    if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+        return narrowed
+    return np.ascontiguousarray(values)
+
+
+def column_values(values):
+    """单列转为orjson可无损序列化的值：数值列为NumPy数组，其余为Python列表（缺失值为None）"""
+    if isinstance(values, (pa.Array, pa.ChunkedArray)):
+        if pa.types.is_floating(values.type) or (
+                (pa.types.is_integer(values.type) or pa.types.is_boolean(values.type))
+                and not values.null_count):
+            return np.ascontiguousarray(values.to_numpy())
+        return values.to_pylist()
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in 'fiub':
+        return np.ascontiguousarray(values.to_numpy())
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def frame_columns(table):
+    """DataFrame或Arrow表转为 {列名: 列值} 字典，浮点数保持完整精度"""
+    if isinstance(table, pa.Table):
+        return {name: column_values(col) for name, col in zip(table.column_names, table.columns)}
+    return {str(name): column_values(table[name]) for name in table.columns}
+
+
+def to_jsonable(obj):
+    """导出JSON前的预处理：数据表按列展开，跳过以下划线开头的内部字段"""
+    if isinstance(obj, (pd.DataFrame, pa.Table)):
+        return frame_columns(obj)
+    if isinstance(obj, dict):
+        return {k: to_jsonable(v) for k, v in obj.items()
+                if not (isinstance(k, str) and k.startswith('_'))}
+    if isinstance(obj, (list, tuple)):
+        return [to_jsonable(v) for v in obj]
+    return obj